@@ -4,11 +4,17 @@ Used to perform every simulated-annealing task.
 """
 
 import math
+import random
+
+import numpy as np
+
+# number of iterations whose random variates (and acceptance thresholds) are drawn at once
+BLOCK_SIZE = 4096
 
 class Annealing:
     def __init__(self, initial_temperature=10, temperature_update='linear',
                 iterations_number=100_000, decay_constant=0.5,
-                gradual_constant_a=1000, gradual_constant_n=2):
+                gradual_constant_a=1000, gradual_constant_n=2, stopping_rules=None):
         self.__initial_temperature = initial_temperature
         self.__iterations_number = iterations_number
         self.__current_iteration = 0
@@ -17,43 +23,142 @@ class Annealing:
         self.__gradual_constant_n = gradual_constant_n
         self.__min_temperature = initial_temperature / iterations_number
         self.__temperature_update = temperature_update
+        # if given (with the time limit), the temperature follows the elapsed fraction of the time limit
+        self.__stopping_rules = stopping_rules
+        # the generator is seeded from the random module, so the seed of the random module determines the run
+        self.__generator = np.random.default_rng(random.getrandbits(64))
+        # -log(u) of the uniform variates u of the next iterations and the lengths the current length
+        # can be exceeded by in these iterations (None if the temperatures depend on the time)
+        self.__variates = []
+        self.__offsets = None
+        self.__index = 0
         self.__temperature_update_switcher = {
             'linear'    : self.__linear_temperature_update,
             'decay'     : self.__decay_temperature_update,
-            'gradual'   : self.__gradual_temperature_update
+            'gradual'   : self.__gradual_temperature_update,
+            'constant'  : self.__constant_temperature_update
         }
 
     def __calculate_temperature(self):
         """Returns the current temperature, using predefined temperature update option.
         """
-        update = self.__temperature_update_switcher.get(self.__temperature_update, lambda: 'Error')
-        return max(self.__min_temperature, update())
+        update = self.__temperature_update_switcher.get(self.__temperature_update, lambda iterations: 'Error')
+        return max(self.__min_temperature, update(self.__elapsed_iterations()))
+
+    def __calculate_temperatures(self, first_iteration, iterations_no):
+        """Returns the temperatures of iterations_no iterations starting at the first_iteration (NumPy array).
+        """
+        update = self.__temperature_update_switcher.get(self.__temperature_update, lambda iterations: 'Error')
+        iterations = np.arange(first_iteration, first_iteration + iterations_no, dtype=np.float64)
+        return np.maximum(self.__min_temperature, update(iterations))
+
+    def __time_dependent(self):
+        return self.__stopping_rules is not None and self.__stopping_rules.time_limit is not None
+
+    def __set_variates(self, variates):
+        """Sets the variates of the next iterations and precomputes their acceptance offsets.
+        """
+        self.__variates = variates.tolist()
+        self.__index = 0
+        self.__offsets = None
+        if not self.__time_dependent():
+            temperatures = self.__calculate_temperatures(self.__current_iteration, len(variates))
+            self.__offsets = (temperatures * variates).tolist()
+
+    def __elapsed_iterations(self):
+        """Returns the number of iterations the temperature corresponds to: the current iteration, or the elapsed
+        fraction of the time limit given in the iterations number.
+        """
+        if not self.__time_dependent():
+            return self.__current_iteration
+        return self.__stopping_rules.elapsed_fraction(self.__current_iteration) * self.__iterations_number
         
-    def __linear_temperature_update(self):
+    def __linear_temperature_update(self, iterations):
         """Updates the temperature in the linear way.
         """
-        fraction = self.__current_iteration / self.__iterations_number
+        fraction = iterations / self.__iterations_number
         subtractedTemperature = fraction * self.__initial_temperature
         return self.__initial_temperature - subtractedTemperature
         
-    def __decay_temperature_update(self): 
+    def __decay_temperature_update(self, iterations): 
         """Updates the temperature in the decay way.
         """
-        decay_coefficient = self.__decay_constant ** self.__current_iteration
+        decay_coefficient = self.__decay_constant ** iterations
         return decay_coefficient * self.__initial_temperature
         
-    def __gradual_temperature_update(self):
+    def __gradual_temperature_update(self, iterations):
         """Updates the temperature in the gradual way.
         """
-        gradual_coefficient = 1 - (self.__current_iteration / self.__gradual_constant_a) ** self.__gradual_constant_n
+        gradual_coefficient = 1 - (iterations / self.__gradual_constant_a) ** self.__gradual_constant_n
         return gradual_coefficient * self.__initial_temperature
 
+    def __constant_temperature_update(self, iterations):
+        """Keeps the initial temperature (used by the chains of the parallel tempering).
+        """
+        return iterations * 0 + self.__initial_temperature
+
+    def set_temperature(self, temperature):
+        """Sets the initial temperature (the temperature itself for the constant update), the variates drawn
+        already are kept for the next iterations.
+        """
+        self.__initial_temperature = temperature
+        self.__min_temperature = temperature / self.__iterations_number
+        self.__set_variates(np.array(self.__variates[self.__index:]))
+
+    def get_temperature(self):
+        """Returns the current temperature.
+        """
+        return self.__calculate_temperature()
+
     def calculate_probability(self, length, new_length):
         """Calculates probability based on the current temperature, length and new_length. 
         """
         temperature = self.__calculate_temperature()
         return math.exp(-(new_length - length)/temperature)
 
+    def calculate_threshold(self, length):
+        """Calculates the length below which a new solution is accepted in the current iteration
+        (exp(-(new_length - length) / temperature) > u is new_length < length - temperature * log(u)).
+        The variates -log(u) are drawn and the offsets -temperature * log(u) are precomputed for blocks of iterations,
+        so that it has to be called exactly once per iteration.
+        """
+        if self.__index == len(self.__variates):
+            self.__set_variates(self.__generator.standard_exponential(BLOCK_SIZE))
+        index = self.__index
+        self.__index += 1
+        if self.__offsets is None:
+            return length + self.__calculate_temperature() * self.__variates[index]
+        return length + self.__offsets[index]
+
+    def get_state(self):
+        """Returns the state of the annealing: its parameters and the iteration counter.
+        """
+        return {
+            'initial_temperature'   : self.__initial_temperature,
+            'temperature_update'    : self.__temperature_update,
+            'iterations_number'     : self.__iterations_number,
+            'current_iteration'     : self.__current_iteration,
+            'decay_constant'        : self.__decay_constant,
+            'gradual_constant_a'    : self.__gradual_constant_a,
+            'gradual_constant_n'    : self.__gradual_constant_n,
+            'generator_state'       : self.__generator.bit_generator.state,
+            'variates'              : np.array(self.__variates[self.__index:])
+        }
+
+    def set_state(self, state):
+        """Restores the state of the annealing returned by get_state.
+        """
+        self.__initial_temperature = state['initial_temperature']
+        self.__temperature_update = state['temperature_update']
+        self.__iterations_number = state['iterations_number']
+        self.__current_iteration = state['current_iteration']
+        self.__decay_constant = state['decay_constant']
+        self.__gradual_constant_a = state['gradual_constant_a']
+        self.__gradual_constant_n = state['gradual_constant_n']
+        self.__min_temperature = self.__initial_temperature / self.__iterations_number
+        self.__generator.bit_generator.state = state['generator_state']
+        self.__set_variates(state['variates'])
+
     def update_iteration(self):
         """Increases the iteration counter by 1 after each iteration.
         """
@@ -0,0 +1,67 @@
+"""AnnealingChain class.
+
+Used to perform the simulated-annealing moves on an array schedule in chunks of iterations,
+so that the chain can be paused to communicate with other chains (see parallel_tempering and island_model).
+"""
+
+from array_schedule import ArraySchedule
+from disjunctive_graph import DisjunctiveGraph
+from giffler_thompson import generate_active_neighbour
+
+class AnnealingChain:
+    def __init__(self, schedule, neighbourhood='n5'):
+        instance = schedule.instance
+        self.current = ArraySchedule(instance)
+        self.current.copy_from(schedule)
+        self.spare = ArraySchedule(instance)
+        self.best = ArraySchedule(instance)
+        self.best.copy_from(schedule)
+        self.neighbourhood = neighbourhood
+        self.graph = None
+        if neighbourhood not in ('shift', 'active'):
+            self.graph = DisjunctiveGraph(instance, neighbourhood=neighbourhood).update(self.current)
+
+    def run(self, annealing, iterations_number, target_makespan=0):
+        """Performs given number of annealing iterations, the temperature is given by the annealing.
+        Stops early when the best schedule reaches the target_makespan.
+        Returns the number of accepted neighbours.
+        """
+        length = self.current.makespan
+        accepted_no = 0
+
+        for step in range(iterations_number):
+            threshold = annealing.calculate_threshold(length)
+            if self.neighbourhood == 'active':
+                neighbour = generate_active_neighbour(self.current, self.spare)
+            elif self.graph is None:
+                neighbour = self.current.generate_neighbour(self.spare)
+            else:
+                neighbour = self.graph.generate_neighbour(self.current, self.spare, limit=threshold)
+
+            if neighbour is not None:
+                new_length = neighbour.makespan
+                # moves keeping the length are accepted on the (small) critical-block neighbourhoods only
+                if new_length < threshold and (new_length != length or self.graph is not None):
+                    self.spare = self.current
+                    self.current = neighbour
+                    length = new_length
+                    accepted_no += 1
+                    if self.graph is not None:
+                        self.graph.update(self.current)
+                    if length < self.best.makespan:
+                        self.best.copy_from(self.current)
+                        if length <= target_makespan:
+                            break
+
+            annealing.update_iteration()
+
+        return accepted_no
+
+    def replace(self, sequence):
+        """Replaces the current schedule by the one given by the machine sequence (see ArraySchedule.set_sequence).
+        """
+        self.current.set_sequence(sequence)
+        if self.graph is not None:
+            self.graph.update(self.current)
+        if self.current.makespan < self.best.makespan:
+            self.best.copy_from(self.current)
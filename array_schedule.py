@@ -0,0 +1,386 @@
+"""ArraySchedule class.
+
+Used to represent a schedule as flat arrays indexed by operation id instead of lists of steps.
+The static data (job_id, step_no, machine_id, duration) is shared through the Instance.
+"""
+
+import heapq
+import random
+from array import array
+
+from step import Step
+
+class ArraySchedule:
+    def __init__(self, instance):
+        operations_no = instance.operations_no
+        self.instance = instance
+
+        self.start = array('i', [0]) * operations_no
+        self.stop = array('i', [0]) * operations_no
+        self.time_before = array('i', [0]) * operations_no
+        # machine order: sequence[machine_offsets[m] : machine_offsets[m] + lengths[m]]
+        self.sequence = array('i', [0]) * operations_no
+        self.lengths = array('i', [0]) * instance.machines_no
+        # operation -> index in sequence, -1 if not scheduled yet
+        self.position = array('i', [-1]) * operations_no
+        self.job_endings = array('i', [0]) * instance.jobs_no
+        # stop of the last operation of every machine queue
+        self.machine_endings = array('i', [0]) * instance.machines_no
+        self.__makespan = 0
+
+        self.__unscheduled = array('i', [-1]) * operations_no
+        self.__no_lengths = array('i', [0]) * instance.machines_no
+        self.__no_job_endings = array('i', [0]) * instance.jobs_no
+        self.__no_machine_endings = array('i', [0]) * instance.machines_no
+
+    def __len__(self):
+        return self.instance.machines_no
+
+    def __iter__(self):
+        for machine_id in range(self.instance.machines_no):
+            yield self.steps(machine_id)
+
+    def __getitem__(self, machine_id):
+        return self.steps(machine_id)
+
+    def steps(self, machine_id):
+        """Returns the machine queue as a list of steps (used for printing and drawing).
+        """
+        instance = self.instance
+        offset = instance.machine_offsets[machine_id]
+        steps = []
+        for index in range(offset, offset + self.lengths[machine_id]):
+            operation = self.sequence[index]
+            steps.append(Step(instance.job_id[operation], instance.step_no[operation],
+                                machine_id, instance.duration[operation],
+                                start=self.start[operation], stop=self.stop[operation],
+                                time_before=self.time_before[operation]))
+        return steps
+
+    def clear(self):
+        """Removes all the operations from the schedule.
+        """
+        self.position[:] = self.__unscheduled
+        self.lengths[:] = self.__no_lengths
+        self.job_endings[:] = self.__no_job_endings
+        self.machine_endings[:] = self.__no_machine_endings
+        self.__makespan = 0
+
+    def copy_from(self, other):
+        """Overwrites the schedule with the content of the other schedule (of the same instance).
+        """
+        self.start[:] = other.start
+        self.stop[:] = other.stop
+        self.time_before[:] = other.time_before
+        self.sequence[:] = other.sequence
+        self.lengths[:] = other.lengths
+        self.position[:] = other.position
+        self.job_endings[:] = other.job_endings
+        self.machine_endings[:] = other.machine_endings
+        self.__makespan = other.__makespan
+
+    @property
+    def makespan(self):
+        """Max (queue) length, kept up to date as the operations are placed.
+        """
+        if self.__makespan is None:
+            self.__makespan = max(self.machine_endings)
+        return self.__makespan
+
+    def __set_machine_ending(self, machine_id, ending):
+        previous_ending = self.machine_endings[machine_id]
+        self.machine_endings[machine_id] = ending
+        if self.__makespan is None:
+            return
+        if ending > self.__makespan:
+            self.__makespan = ending
+        elif ending < previous_ending == self.__makespan:
+            # the longest queue got shorter, the makespan is recomputed when needed
+            self.__makespan = None
+
+    def append(self, operation, start, time_before):
+        """Appends the operation at the end of its machine queue.
+        """
+        instance = self.instance
+        machine_id = instance.machine_id[operation]
+        index = instance.machine_offsets[machine_id] + self.lengths[machine_id]
+        self.sequence[index] = operation
+        self.position[operation] = index
+        self.lengths[machine_id] += 1
+        self.__set_times(operation, start, time_before)
+        self.__set_machine_ending(machine_id, self.stop[operation])
+
+    def insert(self, operation, index, start, time_before):
+        """Inserts the operation into its machine queue before the given sequence index.
+        """
+        instance = self.instance
+        machine_id = instance.machine_id[operation]
+        end = instance.machine_offsets[machine_id] + self.lengths[machine_id]
+        sequence = self.sequence
+        position = self.position
+        # the operations behind the inserted one are shifted by one position
+        for _index in range(end, index, -1):
+            shifted = sequence[_index - 1]
+            sequence[_index] = shifted
+            position[shifted] = _index
+        sequence[index] = operation
+        position[operation] = index
+        self.lengths[machine_id] += 1
+        self.__set_times(operation, start, time_before)
+
+    def __set_times(self, operation, start, time_before):
+        stop = start + self.instance.duration[operation]
+        self.start[operation] = start
+        self.stop[operation] = stop
+        self.time_before[operation] = time_before
+        job_id = self.instance.job_id[operation]
+        if self.job_endings[job_id] < stop:
+            self.job_endings[job_id] = stop
+
+    def set_sequence(self, sequence):
+        """Replaces the machine queues by the complete machine sequence (in the layout of the sequence buffer)
+        and decodes it.
+        Returns the schedule.
+        """
+        instance = self.instance
+        self.sequence[:] = array('i', sequence)
+        for machine_id in range(instance.machines_no):
+            self.lengths[machine_id] = instance.machine_offsets[machine_id + 1] - instance.machine_offsets[machine_id]
+        for index, operation in enumerate(self.sequence):
+            self.position[operation] = index
+        return self.decode()
+
+    def decode(self):
+        """Computes the times of all the operations from the complete machine sequences, in topological order.
+        Returns the schedule.
+        """
+        instance = self.instance
+        start = self.start
+        stop = self.stop
+        sequence = self.sequence
+        position = self.position
+        machine_offsets = instance.machine_offsets
+        duration = instance.duration
+
+        # every operation has at most one job and one machine predecessor
+        in_degree = [(instance.step_no[operation] > 0) + (position[operation] > machine_offsets[instance.machine_id[operation]])
+                        for operation in range(instance.operations_no)]
+        ready = [operation for operation, degree in enumerate(in_degree) if degree == 0]
+        decoded_no = 0
+        while ready:
+            operation = ready.pop()
+            decoded_no += 1
+            index = position[operation]
+            machine_id = instance.machine_id[operation]
+            machine_ending = stop[sequence[index - 1]] if index > machine_offsets[machine_id] else 0
+            predecessor = instance.job_predecessor(operation)
+            job_ready = stop[predecessor] if predecessor >= 0 else 0
+            _start = machine_ending if machine_ending > job_ready else job_ready
+
+            start[operation] = _start
+            stop[operation] = _start + duration[operation]
+            self.time_before[operation] = _start - machine_ending
+
+            successor = instance.job_successor(operation)
+            if successor < 0:
+                self.job_endings[instance.job_id[operation]] = stop[operation]
+            else:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+            if index + 1 < machine_offsets[machine_id] + self.lengths[machine_id]:
+                successor = sequence[index + 1]
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+            else:
+                self.machine_endings[machine_id] = stop[operation]
+
+        if decoded_no != instance.operations_no:
+            raise ValueError('The machine sequences contain a cycle.')
+        self.__makespan = None
+        return self
+
+    def fill(self):
+        """Fills the machine queues with the remaining operations (see main.fill_machine_queues).
+        Returns the schedule filled with all the operations.
+        """
+        instance = self.instance
+        start = self.start
+        stop = self.stop
+        time_before = self.time_before
+        sequence = self.sequence
+
+        for operation in range(instance.operations_no):
+            if self.position[operation] >= 0:
+                continue
+
+            machine_id = instance.machine_id[operation]
+            duration = instance.duration[operation]
+            job_ending = self.job_endings[instance.job_id[operation]]
+            offset = instance.machine_offsets[machine_id]
+            end = offset + self.lengths[machine_id]
+
+            # try to squeeze it into the first gap it fits into
+            squeezed = False
+            for index in range(offset, end):
+                _operation = sequence[index]
+                if start[_operation] > job_ending:
+                    if time_before[_operation] >= duration:
+                        if start[_operation] - duration >= job_ending:
+                            squeezed = True
+
+                            if index == offset:
+                                _start = job_ending
+                                _time_before = job_ending
+                            else:
+                                _previous_stop = stop[sequence[index - 1]]
+                                if _previous_stop >= job_ending:
+                                    _start = _previous_stop
+                                    _time_before = 0
+                                else:
+                                    _start = job_ending
+                                    _time_before = _start - _previous_stop
+
+                            time_before[_operation] = start[_operation] - (_start + duration)
+                            self.insert(operation, index, _start, _time_before)
+                            break
+
+            if not squeezed:
+                if end == offset:
+                    self.append(operation, job_ending, job_ending)
+                else:
+                    machine_ending = stop[sequence[end - 1]]
+                    if machine_ending <= job_ending:
+                        self.append(operation, job_ending, job_ending - machine_ending)
+                    else:
+                        self.append(operation, machine_ending, 0)
+
+        return self
+
+    def generate_neighbour(self, neighbour):
+        """Generates neighbour of the schedule into the given (spare) schedule.
+        Random operation is moved to the left in its machine queue and only the affected operations are re-timed.
+        Returns neighbour (neighbouring solution).
+        """
+        instance = self.instance
+        machine_id = random.randint(0, instance.machines_no - 1) # inclusive
+        index = instance.machine_offsets[machine_id] + random.randint(0, self.lengths[machine_id] - 1)
+
+        neighbour.copy_from(self)
+        neighbour.shift_left(self.sequence[index])
+        return neighbour
+
+    def shift_left(self, operation):
+        """Moves the operation in its machine queue before all the operations that start after its job predecessor ends.
+        The operations placed before it cannot precede the job predecessor, so the schedule stays acyclic.
+        """
+        instance = self.instance
+        sequence = self.sequence
+        offset = instance.machine_offsets[instance.machine_id[operation]]
+        index = self.position[operation]
+
+        predecessor = instance.job_predecessor(operation)
+        job_ready = self.stop[predecessor] if predecessor >= 0 else 0
+
+        new_index = index
+        while new_index > offset and self.start[sequence[new_index - 1]] >= job_ready:
+            new_index -= 1
+
+        self.move(operation, new_index)
+
+    def move(self, operation, new_index):
+        """Moves the operation to the given sequence index of its machine queue and re-times the schedule.
+        The operations in between are shifted by one position. The move must keep the schedule acyclic.
+        """
+        instance = self.instance
+        sequence = self.sequence
+        position = self.position
+        machine_id = instance.machine_id[operation]
+        end = instance.machine_offsets[machine_id] + self.lengths[machine_id]
+        index = position[operation]
+
+        if new_index == index:
+            return
+        if new_index < index:
+            for _index in range(index, new_index, -1):
+                shifted = sequence[_index - 1]
+                sequence[_index] = shifted
+                position[shifted] = _index
+        else:
+            for _index in range(index, new_index):
+                shifted = sequence[_index + 1]
+                sequence[_index] = shifted
+                position[shifted] = _index
+        sequence[new_index] = operation
+        position[operation] = new_index
+
+        # only these operations got a different machine predecessor
+        low = min(index, new_index)
+        high = max(index, new_index)
+        changed = [sequence[low], operation]
+        if new_index + 1 < end:
+            changed.append(sequence[new_index + 1])
+        if high + 1 < end:
+            changed.append(sequence[high + 1])
+
+        self.retime(changed)
+        self.__set_machine_ending(machine_id, self.stop[sequence[end - 1]])
+
+    def retime(self, operations):
+        """Recomputes the times of the given operations, whose predecessors have changed.
+        The change is propagated to the job and machine successors only while their start times change,
+        so the cost is proportional to the affected part of the schedule.
+        """
+        instance = self.instance
+        start = self.start
+        stop = self.stop
+        sequence = self.sequence
+        position = self.position
+        machine_offsets = instance.machine_offsets
+        machine_id = instance.machine_id
+        duration = instance.duration
+        horizon = instance.total_duration
+
+        # processed in order of their start times, which is (nearly) the topological order
+        queued = {operation for operation in operations if operation >= 0}
+        seeds = set(queued)
+        heap = [(start[operation], operation) for operation in queued]
+        heapq.heapify(heap)
+
+        while heap:
+            _, operation = heapq.heappop(heap)
+            queued.discard(operation)
+
+            index = position[operation]
+            machine = machine_id[operation]
+            machine_ending = stop[sequence[index - 1]] if index > machine_offsets[machine] else 0
+            predecessor = instance.job_predecessor(operation)
+            job_ready = stop[predecessor] if predecessor >= 0 else 0
+            _start = machine_ending if machine_ending > job_ready else job_ready
+            if _start > horizon:
+                # the start times of a cycle grow without limit
+                raise ValueError('the machine sequences contain a cycle')
+
+            self.time_before[operation] = _start - machine_ending
+            if _start == start[operation] and operation not in seeds:
+                continue
+            seeds.discard(operation)
+
+            start[operation] = _start
+            stop[operation] = _start + duration[operation]
+
+            successor = instance.job_successor(operation)
+            if successor < 0:
+                self.job_endings[instance.job_id[operation]] = stop[operation]
+            elif successor not in queued:
+                queued.add(successor)
+                heapq.heappush(heap, (start[successor], successor))
+
+            if index + 1 < machine_offsets[machine] + self.lengths[machine]:
+                successor = sequence[index + 1]
+                if successor not in queued:
+                    queued.add(successor)
+                    heapq.heappush(heap, (start[successor], successor))
+            else:
+                self.__set_machine_ending(machine, stop[operation])
@@ -0,0 +1,195 @@
+"""Benchmark runner.
+
+Used to solve the bundled instances with fixed seeds and budgets, to record the speed (iterations per second),
+the time to reach the best known upper bound, the final makespan and its gaps to the known bounds, and to compare
+the report with a stored baseline to flag the regressions in speed or quality.
+
+The arguments not known to the runner are passed to the solver (see main.py -h), for example:
+    python3 benchmark.py -b testdata/benchmark_baseline.json -- -in 5000 -nb n6
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import main
+from lower_bounds import lower_bound, optimality_gap
+from phase_timers import PhaseTimers
+from progress_reporter import ProgressReporter
+from stopping_rules import StoppingRules
+
+DEFAULT_INSTANCES = ['testdata/1/abz5.csv', 'testdata/1/abz7.csv',
+                     'testdata/2/tai15x15_1.csv', 'testdata/2/tai20x15_1.csv', 'testdata/2/tai20x20_1.csv',
+                     'testdata/2/tai30x15_1.csv', 'testdata/2/tai30x20_1.csv', 'testdata/2/tai50x15_1.csv',
+                     'testdata/2/tai50x20_1.csv', 'testdata/2/tai100x20_1.csv']
+DEFAULT_SEEDS                   = [1, 2, 3]
+DEFAULT_SOLVER_ARGUMENTS        = ['-r', 'arrays', '-nb', 'n5', '-in', '2000']
+DEFAULT_SPEED_TOLERANCE         = 20
+DEFAULT_QUALITY_TOLERANCE       = 0
+
+# best known upper and lower bounds of the makespan: of the Taillard instances from the Taillard's summary
+# (http://mistic.heig-vd.ch/taillard/problemes.dir/ordonnancement.dir/ordonnancement.html, the README.md table lists
+# some of them), of abz5 and abz7 (solved to optimality) from JSPLIB (https://github.com/tamy0612/JSPLIB)
+KNOWN_BOUNDS = {
+    'abz5'          : (1234, 1234),
+    'abz7'          : (656, 656),
+    'tai15x15_1'    : (1231, 1005),
+    'tai20x15_1'    : (1376, 1254),
+    'tai20x20_1'    : (1663, 1217),
+    'tai30x15_1'    : (1770, 1764),
+    'tai30x20_1'    : (2064, 1850),
+    'tai50x15_1'    : (2760, 2760),
+    'tai50x20_1'    : (2868, 2868),
+    'tai100x20_1'   : (5464, 5464),
+}
+
+class BenchmarkReporter(ProgressReporter):
+    """Quiet reporter which notes the time when the target length is reached.
+    """
+    def __init__(self, target, lower_bound=0):
+        super().__init__(quiet=True, lower_bound=lower_bound)
+        self.__target = target
+        self.time_to_target = None
+        # the progress is never reported
+        self.next_iteration = float('inf')
+
+    def improved(self, iteration, length, source=None):
+        if self.time_to_target is None and self.__target is not None and length <= self.__target:
+            self.time_to_target = self.elapsed_time()
+
+def get_cmd_arguments():
+    """Parses commandline arguments and provides help when used in shell.
+
+    Returns parsed arguments object and the arguments of the solver.
+    """
+    parser = argparse.ArgumentParser(description='Job Shop Scheduling Problem Solver benchmark.',
+                                     epilog='Other arguments are passed to the solver (see main.py -h). '
+                                     f'Default: {" ".join(DEFAULT_SOLVER_ARGUMENTS)}')
+
+    parser.add_argument('-i', '--instances', type=str, nargs='+',
+                        help='Input filenames. Default: abz5, abz7 and the Taillard instances in testdata.', default=DEFAULT_INSTANCES)
+    parser.add_argument('-s', '--seeds', type=int, nargs='+',
+                        help=f'Seeds of the runs of every instance. Default {DEFAULT_SEEDS}.', default=DEFAULT_SEEDS)
+    parser.add_argument('-o', '--output', type=str, help='File the report is written to (JSON). Default: none.')
+    parser.add_argument('-b', '--baseline', type=str, help='Report to compare the results with (JSON). Default: none.')
+    parser.add_argument('-st', '--speed_tolerance', type=float,
+                        help=f'Allowed slowdown (iterations per second) against the baseline in percent. Default {DEFAULT_SPEED_TOLERANCE}.',
+                        default=DEFAULT_SPEED_TOLERANCE)
+    parser.add_argument('-qt', '--quality_tolerance', type=float,
+                        help=f'Allowed increase of the makespan against the baseline in percent. Default {DEFAULT_QUALITY_TOLERANCE}.',
+                        default=DEFAULT_QUALITY_TOLERANCE)
+
+    args, solver_arguments = parser.parse_known_args()
+    if solver_arguments[:1] == ['--']:
+        solver_arguments = solver_arguments[1:]
+    return args, DEFAULT_SOLVER_ARGUMENTS + solver_arguments
+
+def run(file_name, seed, solver_arguments, timers):
+    """Solves the instance with the seed, the iterations are counted by the timers.
+    Returns the record of the run.
+    """
+    args = main.get_cmd_arguments(['-fn', file_name, '-s', str(seed), '-q'] + solver_arguments)
+    if args.engine not in ('annealing', 'tabu') or args.workers > 1:
+        raise ValueError('the benchmark supports the single-process engines only (annealing with a single worker, tabu)')
+    random.seed(args.seed)
+
+    name = os.path.splitext(os.path.basename(file_name))[0]
+    upper_bound, known_lower_bound = KNOWN_BOUNDS.get(name, (None, 0))
+    instance, jobs = main.read_instance(file_name, steps=args.representation == 'steps')
+    machines_no = instance.machines_no
+    args.lower_bound = lower_bound(instance)
+    best_lower_bound = max(known_lower_bound, args.lower_bound)
+
+    # the comparison of the dispatching rules is not a part of the report (the reporter is quiet)
+    reporter = BenchmarkReporter(upper_bound, lower_bound=args.lower_bound)
+    queues = main.initial_schedule(args, instance, jobs, reporter=reporter)
+    initial_length = main.get_total_length(queues)
+
+    reporter.start()
+    timers.reset()
+    start = time.perf_counter()
+    queues, length = main.search(args, instance, queues, jobs, machines_no, reporter)
+    seconds = time.perf_counter() - start
+    # the search checks the stopping rules before every iteration and once more at the end
+    iterations = max(0, timers.calls('StoppingRules.is_over') - 1)
+
+    return {
+        'instance'              : name,
+        'seed'                  : seed,
+        'iterations'            : iterations,
+        'seconds'               : round(seconds, 4),
+        'iterations_per_second' : round(iterations / seconds, 1) if seconds > 0 else None,
+        'time_to_target'        : round(reporter.time_to_target, 4) if reporter.time_to_target is not None else None,
+        'initial_makespan'      : initial_length,
+        'makespan'              : length,
+        'upper_bound'           : upper_bound,
+        'lower_bound'           : best_lower_bound,
+        'gap_to_upper_bound'    : round(optimality_gap(length, upper_bound), 4) if upper_bound else None,
+        'gap_to_lower_bound'    : round(optimality_gap(length, best_lower_bound), 4),
+    }
+
+def compare(report, baseline, speed_tolerance, quality_tolerance):
+    """Compares the runs of the report with the runs of the baseline (with the same instance and seed).
+    Returns the list of the regressions found.
+    """
+    baseline_runs = {(record['instance'], record['seed']): record for record in baseline['runs']}
+    regressions = []
+    for record in report['runs']:
+        base = baseline_runs.get((record['instance'], record['seed']))
+        if base is None:
+            continue
+        label = f'{record["instance"]} (seed {record["seed"]})'
+        if record['makespan'] > base['makespan'] * (1 + quality_tolerance / 100):
+            regressions.append(f'{label}: makespan {record["makespan"]} against {base["makespan"]}')
+        if (record['iterations_per_second'] is not None and base['iterations_per_second'] is not None and
+                record['iterations_per_second'] < base['iterations_per_second'] * (1 - speed_tolerance / 100)):
+            regressions.append(f'{label}: {record["iterations_per_second"]} iterations/s '
+                                f'against {base["iterations_per_second"]}')
+    return regressions
+
+
+if __name__ == '__main__':
+
+    args, solver_arguments = get_cmd_arguments()
+
+    timers = PhaseTimers()
+    timers.instrument(StoppingRules, ['is_over'])
+
+    print(f'{"instance":<14}{"seed":>6}{"iterations":>12}{"it/s":>10}{"to target [s]":>15}'
+          f'{"initial":>9}{"makespan":>10}{"UB gap":>9}{"LB gap":>9}')
+    runs = []
+    for file_name in args.instances:
+        for seed in args.seeds:
+            record = run(file_name, seed, solver_arguments, timers)
+            runs.append(record)
+            to_target = '-' if record['time_to_target'] is None else f'{record["time_to_target"]:.3f}'
+            upper_gap = '-' if record['gap_to_upper_bound'] is None else f'{record["gap_to_upper_bound"]:.2f}%'
+            print(f'{record["instance"]:<14}{seed:>6}{record["iterations"]:>12}{record["iterations_per_second"] or 0:>10.0f}'
+                  f'{to_target:>15}{record["initial_makespan"]:>9}{record["makespan"]:>10}'
+                  f'{upper_gap:>9}{record["gap_to_lower_bound"]:>8.2f}%', flush=True)
+
+    report = {
+        'solver_arguments'  : solver_arguments,
+        'python'            : platform.python_version(),
+        'machine'           : platform.machine(),
+        'runs'              : runs,
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline['solver_arguments'] != solver_arguments:
+            print(f'Warning: the baseline was run with different solver arguments: {" ".join(baseline["solver_arguments"])}')
+        regressions = compare(report, baseline, args.speed_tolerance, args.quality_tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if regressions:
+            sys.exit(1)
+        print('No regressions against the baseline.')
@@ -0,0 +1,115 @@
+"""Chart layout.
+
+Used to compute the Gantt chart of given solution (its machine labels and the rectangles of the steps and of the
+idle gaps) independently of the renderer, so that the Tk window, the live chart and the image files show the same
+chart.
+"""
+
+WINDOW_DIM_X = 1920
+WINDOW_DIM_Y = 1080
+
+FONT_SIZE = 15
+FONT = ('helvetica', FONT_SIZE, 'normal')
+
+TRANSPARENT = 'black'
+MACHINE_LABEL_COLOUR = 'white'
+STEP_LABEL_COLOUR = 'black'
+
+COLORS = [  'white',        # 1
+            'red',          # 2
+            'yellow',       # 3
+            'darkkhaki',    # 4
+            'pink',         # 5
+            'purple',       # 6
+            'green',        # 7
+            'magenta',      # 8
+            'cyan',         # 9
+            'chocolate',    # 10
+            'brown',        # 11
+            'grey',         # 12
+            'orange',       # 13
+            'gold',         # 14
+            'silver',       # 15
+            'greenyellow',  # 16
+            'blue',    # 17
+            'firebrick',    # 18
+            'darkcyan',     # 19
+            'coral',        # 20
+            'indigo'        # 21
+]
+
+COLORS_NO = len(COLORS)
+
+def machine_height(machines_no):
+    """Returns the height of the row of a machine (one row is left free above and below the machines).
+    """
+    return WINDOW_DIM_Y / (machines_no + 2)
+
+def time_unit_width(machines_no, length):
+    """Returns the width of a single time unit such that the length fits the window.
+    """
+    return (WINDOW_DIM_X - (2 * machine_height(machines_no))) / length
+
+def machine_label(machine_id, height):
+    """Returns the machine label (x, y, text) with (x, y) its center, given the height of the machine rows.
+    """
+    return height / 2, (machine_id + 1.5) * height, f'M {machine_id}'
+
+def step_rectangle(machine_id, start, duration, height, single_time_unit_width):
+    """Returns the rectangle (x1, y1, x2, y2) of the step, given the height of the machine rows.
+    """
+    x1 = height + start * single_time_unit_width
+    y1 = (machine_id + 1) * height
+    return x1, y1, x1 + duration * single_time_unit_width, y1 + height
+
+def job_colour(job_id):
+    """Returns the colour of the steps of the job.
+    """
+    return COLORS[job_id % COLORS_NO]
+
+def step_label(job_id, step_no):
+    """Returns the label of the step.
+    """
+    return f'{job_id}/{step_no}'
+
+def label_fits(root):
+    """Returns the function telling whether the label (text) fits the width, measured in FONT in the Tk root
+    (the widths of the labels are cached). The labels that do not fit their rectangles are not drawn.
+    """
+    # imported only here, the image files are drawn without Tk
+    import tkinter.font
+    measure = tkinter.font.Font(root=root, family=FONT[0], size=FONT[1], weight=FONT[2]).measure
+    widths = {}
+    def fits(text, width):
+        text_width = widths.get(text)
+        if text_width is None:
+            text_width = widths[text] = measure(text)
+        return text_width <= width
+    return fits
+
+def chart_layout(queues, machines_no, length, single_time_unit_width=0):
+    """Computes the chart of the queues, scaled so that the length fits the window if single_time_unit_width is 0.
+    The machine labels are (x, y, text) with (x, y) their center, the rectangles are (x1, y1, x2, y2, colour, label)
+    with the label None for the idle gaps.
+    Returns single time unit width, machine labels, rectangles.
+    """
+    height = machine_height(machines_no)
+
+    if single_time_unit_width == 0:
+        single_time_unit_width = time_unit_width(machines_no, length)
+
+    machine_labels = []
+    rectangles = []
+
+    for machine_id, machine in enumerate(queues):
+        previous_step_end = height # initial value
+        machine_labels.append(machine_label(machine_id, height))
+
+        for step in machine:
+            x1, y1, x2, y2 = step_rectangle(machine_id, step.start, step.duration, height, single_time_unit_width)
+            if step.time_before > 0:
+                rectangles.append((previous_step_end, y1, x1, y2, TRANSPARENT, None))
+            rectangles.append((x1, y1, x2, y2, job_colour(step.job_id), step_label(step.job_id, step.step_no)))
+            previous_step_end = x2
+
+    return single_time_unit_width, machine_labels, rectangles
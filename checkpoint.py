@@ -0,0 +1,45 @@
+"""Checkpoints of the annealing.
+
+Used to save the full state of the annealing (current and best schedule, annealing and stopping rules state,
+random generator state) to a compressed file and to resume the annealing from it exactly where it stopped.
+The array schedules are saved as their machine sequences only, their times are decoded again when loaded.
+"""
+
+import gzip
+import os
+import pickle
+from array import array
+
+from array_schedule import ArraySchedule
+
+def dump_schedule(schedule):
+    """Returns the compact form of the schedule: the machine sequence of the array schedule,
+    the schedule of steps as it is.
+    """
+    if isinstance(schedule, ArraySchedule):
+        return schedule.sequence
+    return schedule
+
+def load_schedule(data, instance):
+    """Returns the schedule given by its compact form (see dump_schedule).
+    """
+    if isinstance(data, array):
+        schedule = ArraySchedule(instance)
+        schedule.set_sequence(data)
+        return schedule
+    return data
+
+def save_checkpoint(file_name, checkpoint):
+    """Saves the checkpoint (dictionary) to the file. The file is replaced at once, so an interruption
+    while saving leaves the previous checkpoint intact.
+    """
+    temporary_file_name = f'{file_name}.tmp'
+    with gzip.open(temporary_file_name, 'wb') as file:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file_name, file_name)
+
+def load_checkpoint(file_name):
+    """Returns the checkpoint (dictionary) saved to the file.
+    """
+    with gzip.open(file_name, 'rb') as file:
+        return pickle.load(file)
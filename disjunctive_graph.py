@@ -0,0 +1,259 @@
+"""DisjunctiveGraph class.
+
+Used to represent the disjunctive graph of an (array) schedule: the job arcs together with the
+machine arcs selected by the machine sequences. Provides the longest paths (heads and tails),
+the critical path with its blocks and the neighbourhoods built on them.
+"""
+
+import math
+import random
+from array import array
+
+import numpy as np
+
+from move_evaluation import best_move, best_swap
+
+class DisjunctiveGraph:
+    def __init__(self, instance, neighbourhood='n5'):
+        operations_no = instance.operations_no
+        self.instance = instance
+        self.neighbourhood = neighbourhood
+
+        # head: longest path from the beginning to the start of the operation
+        self.heads = array('i', [0]) * operations_no
+        # tail: longest path from the end of the operation to the end of the schedule
+        self.tails = array('i', [0]) * operations_no
+        self.machine_predecessor = array('i', [-1]) * operations_no
+        self.machine_successor = array('i', [-1]) * operations_no
+        # operations in topological order
+        self.order = array('i', [0]) * operations_no
+        self.makespan = 0
+        self.moves = []
+        # moves as arrays of operations and targets, used for the batched estimates of the swaps
+        self.move_operations = np.zeros(0, dtype=np.intp)
+        self.move_targets = np.zeros(0, dtype=np.intp)
+
+        self.__neighbourhood_switcher = {
+            'n1'    : self.n1_moves,
+            'n5'    : self.n5_moves,
+            'n6'    : self.n6_moves
+        }
+
+    def update(self, schedule):
+        """Computes heads, tails and the neighbourhood moves of the (complete) schedule.
+        """
+        instance = self.instance
+        duration = instance.duration
+        heads = self.heads
+        tails = self.tails
+        machine_predecessor = self.machine_predecessor
+        machine_successor = self.machine_successor
+        order = self.order
+        sequence = schedule.sequence
+
+        for machine_id in range(instance.machines_no):
+            offset = instance.machine_offsets[machine_id]
+            end = offset + schedule.lengths[machine_id]
+            previous = -1
+            for index in range(offset, end):
+                operation = sequence[index]
+                machine_predecessor[operation] = previous
+                if previous >= 0:
+                    machine_successor[previous] = operation
+                previous = operation
+            if previous >= 0:
+                machine_successor[previous] = -1
+
+        # Kahn's algorithm, every operation has at most one job and one machine predecessor
+        in_degree = [(instance.step_no[operation] > 0) + (machine_predecessor[operation] >= 0)
+                        for operation in range(instance.operations_no)]
+        ready = [operation for operation, degree in enumerate(in_degree) if degree == 0]
+        count = 0
+        while ready:
+            operation = ready.pop()
+            order[count] = operation
+            count += 1
+            for successor in (instance.job_successor(operation), machine_successor[operation]):
+                if successor >= 0:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        ready.append(successor)
+        if count != instance.operations_no:
+            raise ValueError('The machine sequences contain a cycle.')
+
+        for operation in order:
+            head = 0
+            predecessor = instance.job_predecessor(operation)
+            if predecessor >= 0:
+                head = heads[predecessor] + duration[predecessor]
+            predecessor = machine_predecessor[operation]
+            if predecessor >= 0 and heads[predecessor] + duration[predecessor] > head:
+                head = heads[predecessor] + duration[predecessor]
+            heads[operation] = head
+
+        makespan = 0
+        for operation in reversed(order):
+            tail = 0
+            successor = instance.job_successor(operation)
+            if successor >= 0:
+                tail = tails[successor] + duration[successor]
+            successor = machine_successor[operation]
+            if successor >= 0 and tails[successor] + duration[successor] > tail:
+                tail = tails[successor] + duration[successor]
+            tails[operation] = tail
+            if heads[operation] + duration[operation] + tail > makespan:
+                makespan = heads[operation] + duration[operation] + tail
+        self.makespan = makespan
+
+        self.moves = self.__neighbourhood_switcher.get(self.neighbourhood)()
+        moves = np.array(self.moves, dtype=np.intp).reshape(-1, 2)
+        self.move_operations = moves[:, 0]
+        self.move_targets = moves[:, 1]
+        return self
+
+    def is_critical(self, operation):
+        """True if the operation lies on a longest path.
+        """
+        return self.heads[operation] + self.instance.duration[operation] + self.tails[operation] == self.makespan
+
+    def critical_path(self):
+        """Returns a critical (longest) path as the list of operations.
+        Machine arcs are preferred, so that the critical blocks are as long as possible.
+        """
+        instance = self.instance
+        duration = instance.duration
+        operation = next(operation for operation in range(instance.operations_no)
+                            if self.heads[operation] == 0 and self.is_critical(operation))
+        path = [operation]
+        while self.tails[operation] > 0:
+            stop = self.heads[operation] + duration[operation]
+            for successor in (self.machine_successor[operation], instance.job_successor(operation)):
+                if successor >= 0 and self.heads[successor] == stop and self.is_critical(successor):
+                    break
+            operation = successor
+            path.append(operation)
+        return path
+
+    def critical_blocks(self):
+        """Returns the critical blocks: maximal runs of the critical path processed on the same machine.
+        """
+        blocks = []
+        previous = -1
+        for operation in self.critical_path():
+            if previous >= 0 and self.machine_successor[previous] == operation:
+                blocks[-1].append(operation)
+            else:
+                blocks.append([operation])
+            previous = operation
+        return blocks
+
+    def swap_creates_cycle(self, operation, target):
+        """True if swapping the adjacent operations of a machine queue creates a cycle, i.e. if they are
+        consecutive steps of the same job (possible when a job visits the same machine twice).
+        """
+        instance = self.instance
+        return instance.job_successor(operation) == target or instance.job_successor(target) == operation
+
+    def n1_moves(self):
+        """Returns the N1 moves: swaps of all the adjacent operations of the critical blocks.
+        Move (operation, target) puts the operation to the current place of the target in its machine queue.
+        """
+        moves = []
+        for block in self.critical_blocks():
+            moves.extend(move for move in zip(block[:-1], block[1:]) if not self.swap_creates_cycle(*move))
+        return moves
+
+    def n5_moves(self):
+        """Returns the N5 moves: swaps of the first two and the last two operations of the critical blocks,
+        except for the beginning of the first block and the end of the last block.
+        Move (operation, target) puts the operation to the current place of the target in its machine queue.
+        """
+        blocks = self.critical_blocks()
+        moves = []
+        for count, block in enumerate(blocks):
+            if len(block) < 2:
+                continue
+            if count > 0 and not self.swap_creates_cycle(block[0], block[1]):
+                moves.append((block[0], block[1]))
+            if (count < len(blocks) - 1 and (len(block) > 2 or count == 0)
+                    and not self.swap_creates_cycle(block[-2], block[-1])):
+                moves.append((block[-2], block[-1]))
+        return moves
+
+    def n6_moves(self):
+        """Returns the N6 moves: the operations of the critical blocks moved to the beginning or the end of
+        their block and the first and last operations moved into the block, whenever the move keeps the schedule acyclic.
+        Move (operation, target) puts the operation to the current place of the target in its machine queue.
+        """
+        moves = []
+        for block in self.critical_blocks():
+            if len(block) < 2:
+                continue
+            first = block[0]
+            last = block[-1]
+            for operation in block[:-1]:
+                if self.__forward_feasible(operation, last):
+                    moves.append((operation, last))
+            for target in block[1:-1]:
+                if self.__forward_feasible(first, target):
+                    moves.append((first, target))
+            # swapping neighbours is already covered by the forward moves
+            for operation in block[2:]:
+                if self.__backward_feasible(operation, first):
+                    moves.append((operation, first))
+            for target in block[1:-2]:
+                if self.__backward_feasible(last, target):
+                    moves.append((last, target))
+        return moves
+
+    def __forward_feasible(self, operation, target):
+        # moving the operation right behind the target cannot create a cycle
+        successor = self.instance.job_successor(operation)
+        if successor < 0:
+            return True
+        if successor == target:
+            return False
+        duration = self.instance.duration
+        return self.tails[target] + duration[target] >= self.tails[successor] + duration[successor]
+
+    def __backward_feasible(self, operation, target):
+        # moving the operation right before the target cannot create a cycle
+        predecessor = self.instance.job_predecessor(operation)
+        if predecessor < 0:
+            return True
+        if predecessor == target:
+            return False
+        duration = self.instance.duration
+        return self.heads[target] + duration[target] >= self.heads[predecessor] + duration[predecessor]
+
+    def generate_neighbour(self, schedule, neighbour, candidates=1, limit=math.inf):
+        """Generates neighbour of the schedule (the last one the graph was updated with) into the given (spare) schedule
+        by applying a random move of the neighbourhood. With more candidates (or all the moves if candidates is 0),
+        the one with the lowest estimated makespan is chosen. The move is decoded only if its estimate is below the limit.
+        Returns neighbour (neighbouring solution) or None if there is no move worth decoding.
+        """
+        moves_no = len(self.moves)
+        if not moves_no:
+            return None
+
+        if candidates == 1 and limit == math.inf:
+            move = random.choice(self.moves)
+        else:
+            if 0 < candidates < moves_no:
+                chosen = random.sample(range(moves_no), candidates)
+            else:
+                chosen = range(moves_no)
+
+            if self.neighbourhood == 'n6':
+                move, estimate = best_move(self, [self.moves[count] for count in chosen])
+            else:
+                # the other neighbourhoods consist of adjacent swaps only
+                chosen = np.asarray(chosen, dtype=np.intp)
+                move, estimate = best_swap(self, self.move_operations[chosen], self.move_targets[chosen])
+            if estimate >= limit:
+                return None
+
+        operation, target = move
+        neighbour.copy_from(schedule)
+        neighbour.move(operation, neighbour.position[target])
+        return neighbour
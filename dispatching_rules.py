@@ -0,0 +1,88 @@
+"""Priority dispatching rules.
+
+Used to build the initial schedules in a single pass: every rule assigns a priority to each operation
+and the active schedule is built by giffler_thompson, which chooses the operation with the lowest
+priority value out of every conflict set.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from giffler_thompson import giffler_thompson
+
+def remaining_work(instance):
+    """Returns the total duration of every operation and the later steps of its job, indexed by operation id.
+    """
+    work = [0] * instance.operations_no
+    for job in range(instance.jobs_no):
+        total = 0
+        for operation in reversed(range(instance.job_offsets[job], instance.job_offsets[job + 1])):
+            total += instance.duration[operation]
+            work[operation] = total
+    return work
+
+def spt_priorities(instance):
+    """Shortest processing time first.
+    """
+    return list(instance.duration)
+
+def lpt_priorities(instance):
+    """Longest processing time first.
+    """
+    return [-duration for duration in instance.duration]
+
+def mwkr_priorities(instance):
+    """Most work remaining (in the job) first.
+    """
+    return [-work for work in remaining_work(instance)]
+
+def mopnr_priorities(instance):
+    """Most operations remaining (in the job) first.
+    """
+    return [instance.step_no[operation] - (instance.job_offsets[instance.job_id[operation] + 1] - instance.job_offsets[instance.job_id[operation]])
+            for operation in range(instance.operations_no)]
+
+def fifo_priorities(instance):
+    """First in first out: the operation which could arrive at the machine earliest (its job predecessors
+    processed without waiting) first.
+    """
+    work = remaining_work(instance)
+    return [work[instance.job_offsets[instance.job_id[operation]]] - work[operation]
+            for operation in range(instance.operations_no)]
+
+def random_priorities(instance):
+    """Random choice weighted by the remaining work: the conflict set member with the highest u ** (1 / w)
+    is chosen, so every operation is chosen with the probability proportional to its weight w.
+    """
+    return [-random.random() ** (1 / max(work, 1)) for work in remaining_work(instance)]
+
+RULES = {
+    'spt': spt_priorities,
+    'lpt': lpt_priorities,
+    'mwkr': mwkr_priorities,
+    'mopnr': mopnr_priorities,
+    'fifo': fifo_priorities,
+    'random': random_priorities,
+}
+
+def dispatch(instance, rule, seed=None):
+    """Builds the schedule with the dispatching rule (name from RULES).
+    Returns the (array) schedule.
+    """
+    if seed is not None:
+        random.seed(seed)
+    return giffler_thompson(instance, RULES[rule](instance))
+
+def dispatch_all(instance, rules=RULES, workers=1, seed=None):
+    """Builds the schedules with all the rules, in workers parallel processes if workers > 1.
+    Returns the list of (rule, schedule) pairs, the best schedule first.
+    """
+    rules = list(rules)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(rules))) as executor:
+            schedules = list(executor.map(dispatch, [instance] * len(rules), rules, [seed] * len(rules)))
+    else:
+        schedules = [dispatch(instance, rule, seed) for rule in rules]
+    results = list(zip(rules, schedules))
+    results.sort(key=lambda result: result[1].makespan)
+    return results
@@ -0,0 +1,96 @@
+"""Giffler-Thompson algorithm.
+
+Builds active schedules from operation priorities. The schedulable operations are kept in a heap by
+their earliest completion times and every machine keeps its schedulable operations in a heap by their
+priorities, so the whole schedule is built in O(N log N) (on average).
+"""
+
+import heapq
+import random
+from array import array
+
+from array_schedule import ArraySchedule
+
+def giffler_thompson(instance, priorities, schedule=None):
+    """Builds the active schedule: the operation with the earliest completion time determines the machine,
+    out of the operations on this machine that could start before that completion (the conflict set)
+    the one with the lowest priority value is scheduled.
+    The schedule (if given) is overwritten, so no schedule is allocated.
+    Returns the schedule.
+    """
+    if schedule is None:
+        schedule = ArraySchedule(instance)
+    schedule.clear()
+
+    duration = instance.duration
+    machine_id = instance.machine_id
+    job_id = instance.job_id
+    # stop of the last scheduled operation of every job and every machine
+    job_endings = schedule.job_endings
+    machine_endings = schedule.machine_endings
+
+    completions = []
+    machine_candidates = [[] for _ in range(instance.machines_no)]
+
+    def make_schedulable(operation):
+        machine = machine_id[operation]
+        start = max(job_endings[job_id[operation]], machine_endings[machine])
+        heapq.heappush(completions, (start + duration[operation], operation))
+        heapq.heappush(machine_candidates[machine], (priorities[operation], operation))
+
+    for job in range(instance.jobs_no):
+        if instance.job_offsets[job] < instance.job_offsets[job + 1]:
+            make_schedulable(instance.job_offsets[job])
+
+    while completions:
+        completion, operation = heapq.heappop(completions)
+        if schedule.position[operation] >= 0:
+            continue
+        machine = machine_id[operation]
+        start = max(job_endings[job_id[operation]], machine_endings[machine])
+        if start + duration[operation] != completion:
+            # the machine got busy since the entry was made
+            heapq.heappush(completions, (start + duration[operation], operation))
+            continue
+
+        # the operation with the best priority out of the conflict set
+        candidates = machine_candidates[machine]
+        skipped = []
+        while True:
+            candidate = heapq.heappop(candidates)
+            if candidate[1] == operation or job_endings[job_id[candidate[1]]] < completion:
+                break
+            skipped.append(candidate)
+        for _candidate in skipped:
+            heapq.heappush(candidates, _candidate)
+        chosen = candidate[1]
+        if chosen != operation:
+            heapq.heappush(completions, (completion, operation))
+
+        machine_ending = machine_endings[machine]
+        start = max(job_endings[job_id[chosen]], machine_ending)
+        schedule.append(chosen, start, start - machine_ending)
+
+        successor = instance.job_successor(chosen)
+        if successor >= 0:
+            make_schedulable(successor)
+
+    return schedule
+
+def generate_active_neighbour(schedule, neighbour):
+    """Generates neighbour of the schedule into the given (spare) schedule: the start times serve as the priorities,
+    a random operation gets the priority of its machine predecessor and the priorities are decoded by giffler_thompson.
+    Returns neighbour (neighbouring solution).
+    """
+    instance = schedule.instance
+    priorities = array('i', schedule.start)
+
+    machine_id = random.randint(0, instance.machines_no - 1) # inclusive
+    offset = instance.machine_offsets[machine_id]
+    if schedule.lengths[machine_id] > 1:
+        index = offset + random.randint(1, schedule.lengths[machine_id] - 1)
+        operation = schedule.sequence[index]
+        predecessor = schedule.sequence[index - 1]
+        priorities[operation], priorities[predecessor] = priorities[predecessor], priorities[operation]
+
+    return giffler_thompson(instance, priorities, neighbour)
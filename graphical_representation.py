@@ -5,92 +5,68 @@ Provides the graphical representation of given solution.
 
 from graphics import *
 
-WINDOW_DIM_X = 1920
-WINDOW_DIM_Y = 1080
+from chart_layout import (WINDOW_DIM_X, WINDOW_DIM_Y, FONT_SIZE, FONT, TRANSPARENT, MACHINE_LABEL_COLOUR,
+                            STEP_LABEL_COLOUR, chart_layout, label_fits)
 
-FONT_SIZE = 15
-
-TRANSPARENT = 'black'
-MACHINE_LABEL_COLOUR = 'white'
-STEP_LABEL_COLOUR = 'black'
+def draw_objects(win, machine_labels, rectangles):
+    """Draws the chart (see chart_layout) object by object, every one updating the window.
+    """
+    for x, y, text in machine_labels:
+        machine_label = Text(Point(x, y), text)
+        machine_label.setTextColor(MACHINE_LABEL_COLOUR)
+        machine_label.setSize(FONT_SIZE)
+        machine_label.draw(win)
 
-COLORS = [  'white',        # 1
-            'red',          # 2
-            'yellow',       # 3
-            'darkkhaki',    # 4
-            'pink',         # 5
-            'purple',       # 6 
-            'green',        # 7     
-            'magenta',      # 8 
-            'cyan',         # 9
-            'chocolate',    # 10
-            'brown',        # 11
-            'grey',         # 12
-            'orange',       # 13
-            'gold',         # 14
-            'silver',       # 15
-            'greenyellow',  # 16
-            'blue',    # 17
-            'firebrick',    # 18
-            'darkcyan',     # 19
-            'coral',        # 20
-            'indigo'        # 21
-]
+    for x1, y1, x2, y2, colour, text in rectangles:
+        rect = Rectangle(Point(x1, y1), Point(x2, y2))
+        rect.setFill(colour)
+        rect.draw(win)
 
-COLORS_NO = len(COLORS)
+        if text is not None:
+            label = Text(rect.getCenter(), text)
+            label.setSize(FONT_SIZE)
+            label.setTextColor(STEP_LABEL_COLOUR)
+            label.draw(win)
 
-def draw_chart(queues, machines_no, jobs_no, length, labels=False, single_time_unit_width=0, name=''):
-    """Draws chart as the graphical interpretation.
+def draw_batched(win, machine_labels, rectangles):
+    """Draws the chart (see chart_layout) at once: the canvas items of all the objects are created by a single
+    Tcl script and the window is updated only after that. The labels of the steps that do not fit their rectangles
+    are skipped.
     """
-    machine_height = WINDOW_DIM_Y / (machines_no + 2)
+    fits = label_fits(win)
+    font = '{%s %d %s}' % FONT
+    canvas = win._w
 
-    if single_time_unit_width == 0:
-        single_time_unit_width = (WINDOW_DIM_X - (2 * machine_height)) / length 
-    
-    win = GraphWin(name, WINDOW_DIM_X, WINDOW_DIM_Y)
-    win.setBackground(TRANSPARENT)
+    commands = []
+    for x, y, text in machine_labels:
+        commands.append(f'{canvas} create text {x} {y} -text {{{text}}} -fill {MACHINE_LABEL_COLOUR} -font {font}')
 
-    machine_label_x = machine_height / 2
+    for x1, y1, x2, y2, colour, text in rectangles:
+        commands.append(f'{canvas} create rectangle {x1} {y1} {x2} {y2} -fill {colour}')
 
-    for machine_id, machine in enumerate(queues):
-        previous_step_end = machine_height # initial value
-        
-        starting_point_top = (machine_id * machine_height) + machine_height
-        ending_point_bottom = starting_point_top + machine_height
-        machine_label_y = (ending_point_bottom + starting_point_top) / 2
-        
-        machine_label = Text(Point(machine_label_x, machine_label_y), f'M {machine_id}')
-        machine_label.setTextColor(MACHINE_LABEL_COLOUR)
-        machine_label.setSize(FONT_SIZE)
+        if text is not None and fits(text, x2 - x1):
+            commands.append(f'{canvas} create text {(x1 + x2) / 2} {(y1 + y2) / 2} -text {{{text}}} '
+                            f'-fill {STEP_LABEL_COLOUR} -font {font}')
 
-        machine_label.draw(win)
+    win.tk.eval('\n'.join(commands))
+    win.flush()
 
-        for step in machine:            
-            if step.time_before > 0:
-                black_rect_width = step.time_before * single_time_unit_width
-                next_step_end = previous_step_end + black_rect_width
-                black_rect = Rectangle(Point(previous_step_end, starting_point_top), 
-                                        Point(next_step_end, ending_point_bottom))
-                black_rect.setFill(TRANSPARENT)
-                black_rect.draw(win)
-                previous_step_end = next_step_end
-            
-            rect_width = step.duration * single_time_unit_width
-            next_step_end = previous_step_end + rect_width
-            rect = Rectangle(Point(previous_step_end, starting_point_top),
-                                Point(next_step_end, ending_point_bottom))
-            rect.setFill(COLORS[step.job_id % COLORS_NO])
-            rect.draw(win)
+def draw_chart(queues, machines_no, jobs_no, length, labels=False, single_time_unit_width=0, name='', batched=True):
+    """Draws chart as the graphical interpretation (in the batched mode unless batched is False).
+    """
+    single_time_unit_width, machine_labels, rectangles = chart_layout(queues, machines_no, length,
+                                                                        single_time_unit_width=single_time_unit_width)
 
-            label = Text(rect.getCenter(), f'{step.job_id}/{step.step_no}')
-            label.setSize(FONT_SIZE)
-            label.setTextColor(STEP_LABEL_COLOUR)
-            label.draw(win)
+    win = GraphWin(name, WINDOW_DIM_X, WINDOW_DIM_Y, autoflush=not batched)
+    win.setBackground(TRANSPARENT)
 
-            previous_step_end = next_step_end
+    if batched:
+        draw_batched(win, machine_labels, rectangles)
+    else:
+        draw_objects(win, machine_labels, rectangles)
 
     try:
         win.getMouse()
         win.close()
     finally:
-        return single_time_unit_width
\ No newline at end of file
+        return single_time_unit_width
@@ -0,0 +1,78 @@
+"""Image chart.
+
+Used to save the graphical representation of given solution to image files without a display: always to an SVG
+file and also to a PNG file when the Pillow imaging library is installed.
+"""
+
+from xml.sax.saxutils import escape
+
+from chart_layout import (WINDOW_DIM_X, WINDOW_DIM_Y, FONT_SIZE, TRANSPARENT, MACHINE_LABEL_COLOUR,
+                            STEP_LABEL_COLOUR, chart_layout)
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+# Tk font sizes are given in points, the image sizes in pixels
+FONT_SIZE_PX = round(FONT_SIZE * 4 / 3)
+
+def save_svg(file_name, machine_labels, rectangles, name=''):
+    """Writes the chart (see chart_layout) to the SVG file.
+    """
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{WINDOW_DIM_X}" height="{WINDOW_DIM_Y}" '
+             f'viewBox="0 0 {WINDOW_DIM_X} {WINDOW_DIM_Y}" font-family="Helvetica, Arial, sans-serif" '
+             f'font-size="{FONT_SIZE_PX}" text-anchor="middle" dominant-baseline="central">',
+             f'<title>{escape(name)}</title>',
+             f'<rect width="100%" height="100%" fill="{TRANSPARENT}"/>']
+
+    for x, y, text in machine_labels:
+        lines.append(f'<text x="{x:.2f}" y="{y:.2f}" fill="{MACHINE_LABEL_COLOUR}">{escape(text)}</text>')
+
+    labels = []
+    for x1, y1, x2, y2, colour, text in rectangles:
+        lines.append(f'<rect x="{x1:.2f}" y="{y1:.2f}" width="{x2 - x1:.2f}" height="{y2 - y1:.2f}" '
+                     f'fill="{colour}" stroke="black"/>')
+        if text is not None:
+            labels.append(f'<text x="{(x1 + x2) / 2:.2f}" y="{(y1 + y2) / 2:.2f}">{escape(text)}</text>')
+
+    # the step labels are drawn over all the rectangles, as in the window
+    lines.append(f'<g fill="{STEP_LABEL_COLOUR}">')
+    lines.extend(labels)
+    lines.append('</g>')
+    lines.append('</svg>')
+
+    with open(file_name, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+def save_png(file_name, machine_labels, rectangles):
+    """Writes the chart (see chart_layout) to the PNG file (requires Pillow).
+    """
+    image = Image.new('RGB', (WINDOW_DIM_X, WINDOW_DIM_Y), TRANSPARENT)
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.truetype('DejaVuSans.ttf', FONT_SIZE_PX)
+    except OSError:
+        font = ImageFont.load_default()
+
+    for x, y, text in machine_labels:
+        draw.text((x, y), text, fill=MACHINE_LABEL_COLOUR, font=font, anchor='mm')
+
+    for x1, y1, x2, y2, colour, text in rectangles:
+        draw.rectangle((x1, y1, x2, y2), fill=colour, outline='black')
+    for x1, y1, x2, y2, colour, text in rectangles:
+        if text is not None:
+            draw.text(((x1 + x2) / 2, (y1 + y2) / 2), text, fill=STEP_LABEL_COLOUR, font=font, anchor='mm')
+
+    image.save(file_name)
+
+def save_chart(queues, machines_no, jobs_no, length, file_name, single_time_unit_width=0, name=''):
+    """Saves the chart to file_name.svg (and file_name.png if Pillow is installed).
+    Returns single time unit width.
+    """
+    single_time_unit_width, machine_labels, rectangles = chart_layout(queues, machines_no, length,
+                                                                        single_time_unit_width=single_time_unit_width)
+    save_svg(f'{file_name}.svg', machine_labels, rectangles, name=name)
+    if Image is not None:
+        save_png(f'{file_name}.png', machine_labels, rectangles)
+    return single_time_unit_width
@@ -0,0 +1,44 @@
+"""Instance class.
+
+Used to hold the static data of a problem instance in flat arrays indexed by operation id.
+Operations are numbered job after job, in the order of their steps.
+"""
+
+from array import array
+
+import numpy as np
+
+class Instance:
+    def __init__(self, machine_ids, durations):
+        # arrays jobs_no x machines_no (see instance_loader)
+        jobs_no, machines_no = machine_ids.shape
+        self.jobs_no = jobs_no
+        self.machines_no = machines_no
+
+        self.job_id = array('i', np.repeat(np.arange(jobs_no, dtype=np.intc), machines_no).tobytes())
+        self.step_no = array('i', np.tile(np.arange(machines_no, dtype=np.intc), jobs_no).tobytes())
+        self.machine_id = array('i', machine_ids.astype(np.intc).tobytes())
+        self.duration = array('i', durations.astype(np.intc).tobytes())
+        # operations of job j are job_offsets[j] ... job_offsets[j + 1] - 1
+        self.job_offsets = array('i', np.arange(0, jobs_no * machines_no + 1, machines_no, dtype=np.intc).tobytes())
+
+        self.operations_no = len(self.job_id)
+        # no operation of an acyclic schedule starts later than this
+        self.total_duration = sum(self.duration)
+
+        # every machine gets its own segment of machine_offsets[m] ... machine_offsets[m + 1] - 1
+        # in the machine sequence buffers of the schedules
+        counts = np.bincount(np.frombuffer(self.machine_id, dtype=np.intc), minlength=machines_no)
+        self.machine_offsets = array('i', np.concatenate(([0], np.cumsum(counts))).astype(np.intc).tobytes())
+
+    def job_predecessor(self, operation):
+        """Returns the previous operation of the same job (-1 for the first step).
+        """
+        return -1 if self.step_no[operation] == 0 else operation - 1
+
+    def job_successor(self, operation):
+        """Returns the next operation of the same job (-1 for the last step).
+        """
+        if operation + 1 == self.job_offsets[self.job_id[operation] + 1]:
+            return -1
+        return operation + 1
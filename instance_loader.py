@@ -0,0 +1,106 @@
+"""Instance loader.
+
+Used to read an instance file of any of the supported formats, recognized by its content:
+ - OR-Library: the numbers of jobs and machines, then a line of (machine_id, duration) pairs per job,
+ - Taillard: the numbers of jobs and machines, then the block of durations after 'Times' and the block of
+   machine ids (counted from 1) after 'Machines'.
+The file is parsed into arrays of machine ids and durations (jobs_no x machines_no), which are cached in a binary
+(.npy) file named by the hash of the content, so that the next runs on the same instance do not parse it again
+(the small files are parsed faster than the cache is read, so they are never cached).
+The instance is built from the arrays directly, the steps are created only when the search works on them.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from instance import Instance
+from step import Step
+
+# bumped when the parsed arrays change, so that the cached ones are not used anymore
+CACHE_VERSION = b'1'
+# files shorter than this (in bytes) are parsed instead of cached
+CACHE_MIN_SIZE = 1024
+
+def sniff_format(tokens):
+    """Recognizes the format of the instance given by its whitespace separated tokens.
+    Returns 'orlib' or 'taillard'.
+    """
+    for token in tokens:
+        if not token.lstrip('-').isdigit():
+            if token.lower() == 'times':
+                return 'taillard'
+            raise ValueError(f'unknown instance format (unexpected "{token}")')
+    return 'orlib'
+
+def parse_instance(content):
+    """Parses the instance given by the content of its file (of any supported format).
+    Returns machine ids, durations (int32 arrays jobs_no x machines_no, machine ids counted from 0).
+    """
+    tokens = content.split()
+    if len(tokens) < 2:
+        raise ValueError('missing numbers of jobs and machines')
+    jobs_no = int(tokens[0])
+    machines_no = int(tokens[1])
+    shape = (jobs_no, machines_no)
+
+    if sniff_format(tokens) == 'taillard':
+        lower_tokens = [token.lower() for token in tokens]
+        times = lower_tokens.index('times')
+        machines = lower_tokens.index('machines')
+        durations = np.array(tokens[times + 1:machines], dtype=np.int32)
+        machine_ids = np.array(tokens[machines + 1:], dtype=np.int32) - 1
+        if durations.size != jobs_no * machines_no or machine_ids.size != jobs_no * machines_no:
+            raise ValueError(f'expected {jobs_no} x {machines_no} durations and machine ids')
+        return machine_ids.reshape(shape), durations.reshape(shape)
+
+    pairs = np.array(tokens[2:], dtype=np.int32)
+    if pairs.size != 2 * jobs_no * machines_no:
+        raise ValueError(f'expected {jobs_no} x {machines_no} (machine_id, duration) pairs')
+    pairs = pairs.reshape(jobs_no, machines_no, 2)
+    return np.ascontiguousarray(pairs[:, :, 0]), np.ascontiguousarray(pairs[:, :, 1])
+
+def load_arrays(file_name, cache_dir=None):
+    """Reads the instance from the file, from the cache in cache_dir if it was parsed already (no cache if None).
+    Returns machine ids, durations (see parse_instance).
+    """
+    with open(file_name, 'rb') as file:
+        content = file.read()
+    if cache_dir is None or len(content) < CACHE_MIN_SIZE:
+        return parse_instance(content.decode())
+
+    cache_file_name = os.path.join(cache_dir, f'{hashlib.sha256(CACHE_VERSION + content).hexdigest()}.npy')
+    try:
+        # machine ids and durations stacked into a single array
+        cached = np.load(cache_file_name)
+        return cached[0], cached[1]
+    except (OSError, ValueError):
+        pass
+
+    machine_ids, durations = parse_instance(content.decode())
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # the file is replaced at once, so a concurrent run never reads a partial one
+        temporary_file_name = f'{cache_file_name[:-len(".npy")]}.{os.getpid()}.tmp.npy'
+        np.save(temporary_file_name, np.stack([machine_ids, durations]))
+        os.replace(temporary_file_name, cache_file_name)
+    except OSError:
+        # the cache is only an optimisation
+        pass
+    return machine_ids, durations
+
+def jobs_from_arrays(machine_ids, durations):
+    """Returns the list of jobs (lists of steps) given by the arrays of machine ids and durations.
+    """
+    return [[Step(job_id, step_no, machine_id, duration)
+                for step_no, (machine_id, duration) in enumerate(zip(job_machine_ids, job_durations))]
+            for job_id, (job_machine_ids, job_durations) in enumerate(zip(machine_ids.tolist(), durations.tolist()))]
+
+def load_instance(file_name, cache_dir=None, steps=False):
+    """Reads the instance from the file (see load_arrays), together with its list of jobs (lists of steps) if steps.
+    Returns instance, list of jobs (None unless steps).
+    """
+    machine_ids, durations = load_arrays(file_name, cache_dir=cache_dir)
+    jobs = jobs_from_arrays(machine_ids, durations) if steps else None
+    return Instance(machine_ids, durations), jobs
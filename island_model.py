@@ -0,0 +1,126 @@
+"""Island model.
+
+Several islands run their own annealing in parallel processes. After every migration interval each island
+publishes its best schedule to its slot of the elite buffer in the shared memory and takes the schedule of
+the previous island (ring topology) if it is better than its current one. The schedules migrate as the
+machine sequences only (one integer per operation), nothing is pickled.
+"""
+
+import multiprocessing
+import queue
+import random
+
+import numpy as np
+
+from annealing import Annealing
+from annealing_chain import AnnealingChain
+from array_schedule import ArraySchedule
+from stopping_rules import StoppingRules
+
+class EliteBuffer:
+    def __init__(self, slots_no, operations_no):
+        self.__slots_no = slots_no
+        self.__slot_size = operations_no + 1
+        # every slot: makespan (0 if empty), machine sequence
+        self.__buffer = multiprocessing.Array('i', slots_no * self.__slot_size)
+
+    def publish(self, slot, schedule):
+        """Stores the schedule in the slot.
+        """
+        start = slot * self.__slot_size
+        with self.__buffer.get_lock():
+            view = np.frombuffer(self.__buffer.get_obj(), dtype=np.intc)
+            view[start] = schedule.makespan
+            view[start + 1:start + self.__slot_size] = np.frombuffer(schedule.sequence, dtype=np.intc)
+
+    def read(self, slot):
+        """Returns the makespan and a copy of the machine sequence stored in the slot (makespan 0 if it is empty).
+        """
+        start = slot * self.__slot_size
+        with self.__buffer.get_lock():
+            view = np.frombuffer(self.__buffer.get_obj(), dtype=np.intc)
+            return int(view[start]), view[start + 1:start + self.__slot_size].copy()
+
+def island_worker(island_id, islands_no, schedule, elite, annealing_parameters, stopping_rules,
+                    migration_interval, neighbourhood, target_reached, seed, progress):
+    """Runs the annealing of a single island in a worker process until the stopping rules end it.
+    Every new best length is put to the progress queue together with the island_id.
+    The island which reaches the target makespan sets the target_reached event, which stops all the islands.
+    """
+    random.seed(seed)
+    stopping_rules.start()
+    annealing = Annealing(iterations_number=stopping_rules.iterations_number, stopping_rules=stopping_rules,
+                            **annealing_parameters)
+    chain = AnnealingChain(schedule, neighbourhood=neighbourhood)
+    best_length = chain.best.makespan
+
+    iteration = 0
+    while not target_reached.is_set() and not stopping_rules.is_over(iteration, best_length):
+        iterations = stopping_rules.remaining_iterations(iteration, migration_interval)
+        chain.run(annealing, iterations, target_makespan=stopping_rules.target_makespan)
+        iteration += iterations
+        if stopping_rules.is_reached(chain.best.makespan):
+            target_reached.set()
+
+        elite.publish(island_id, chain.best)
+        immigrant_length, immigrant = elite.read((island_id - 1) % islands_no)
+        if 0 < immigrant_length < chain.current.makespan:
+            chain.replace(immigrant)
+
+        if chain.best.makespan < best_length:
+            best_length = chain.best.makespan
+            stopping_rules.improved(iteration)
+            progress.put((island_id, best_length))
+
+    elite.publish(island_id, chain.best)
+
+def island_model(schedule, islands_no=4, stopping_rules=None, migration_interval=500,
+                    neighbourhood='n5', annealing_parameters=None, lower_bound=0, seed=None, reporter=None):
+    """Performs the annealing on islands_no islands in parallel processes starting from given (array) schedule.
+    Every island runs the annealing given by annealing_parameters (keyword arguments of Annealing)
+    until the stopping rules (counting the iterations of a single island) end it.
+    New best lengths are reported by the reporter (if given).
+    Returns the best schedule found.
+    """
+    if stopping_rules is None:
+        stopping_rules = StoppingRules(iterations_number=50_000, target_makespan=lower_bound)
+    instance = schedule.instance
+    elite = EliteBuffer(islands_no, instance.operations_no)
+    progress = multiprocessing.Queue()
+    target_reached = multiprocessing.Event()
+    processes = []
+    for island_id in range(islands_no):
+        island_seed = seed + island_id if seed is not None else random.randrange(2 ** 32)
+        process = multiprocessing.Process(target=island_worker,
+                                            args=(island_id, islands_no, schedule, elite, annealing_parameters or {},
+                                                    stopping_rules, migration_interval, neighbourhood,
+                                                    target_reached, island_seed, progress))
+        process.start()
+        processes.append(process)
+
+    best_length = schedule.makespan
+    try:
+        while any(process.is_alive() for process in processes) or not progress.empty():
+            try:
+                island_id, length = progress.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if length < best_length:
+                best_length = length
+                if reporter is not None:
+                    reporter.improved(None, length, source=f'Island {island_id}')
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+
+    best = ArraySchedule(instance)
+    best.copy_from(schedule)
+    for island_id in range(islands_no):
+        length, sequence = elite.read(island_id)
+        if 0 < length < best.makespan:
+            best.set_sequence(sequence)
+    return best
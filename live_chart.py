@@ -0,0 +1,163 @@
+"""LiveChart class.
+
+Used to watch the search: the chart of the schedule stays in a window and follows the best schedule found. The search
+runs in a background thread and only copies the start times of its new best schedules into a buffer (straight from
+the arrays of the array schedules, without creating their steps), while the window (Tk can be used by a single thread)
+is redrawn by the main thread with the latest of them (at most once per interval), moving only the steps whose times
+changed.
+"""
+
+import threading
+import time
+from array import array
+
+from graphics import GraphWin, GraphicsError
+
+from array_schedule import ArraySchedule
+from chart_layout import (WINDOW_DIM_X, WINDOW_DIM_Y, FONT, TRANSPARENT, MACHINE_LABEL_COLOUR, STEP_LABEL_COLOUR,
+                            machine_height, time_unit_width, machine_label, step_rectangle, job_colour, step_label,
+                            label_fits)
+
+# number of seconds between the checks of the pending schedule and of the window events
+POLL_INTERVAL = 0.05
+
+def take_snapshot(queues):
+    """Returns the list of (job_id, step_no, machine_id, start, duration) of the steps of the queues.
+    """
+    return [(step.job_id, step.step_no, machine_id, step.start, step.duration)
+            for machine_id, queue in enumerate(queues) for step in queue]
+
+def copy_starts(instance, queues, starts):
+    """Copies the start times of the steps of the queues (a schedule of either representation) to the starts
+    (indexed by operation id).
+    """
+    if isinstance(queues, ArraySchedule):
+        starts[:] = queues.start
+        return
+    for queue in queues:
+        for step in queue:
+            starts[instance.job_offsets[step.job_id] + step.step_no] = step.start
+
+class LiveChart:
+    def __init__(self, instance, queues, length, name='', interval=0.5):
+        self.__instance = instance
+        machines_no = instance.machines_no
+        self.__name = name
+        self.__interval = interval
+        self.__machine_height = machine_height(machines_no)
+        # the scale is fixed by the initial length, so the rectangles only move (and their labels fit or not for good)
+        self.single_time_unit_width = time_unit_width(machines_no, length)
+        # starts (by operation id) of the latest best schedule written by the search thread, swapped with the drawn
+        # ones under the lock, so that neither of them is allocated again
+        self.__pending = array('i', [0]) * instance.operations_no
+        self.__drawn = array('i', [0]) * instance.operations_no
+        # length of the pending schedule, None when it was drawn already
+        self.__pending_length = None
+        self.__lock = threading.Lock()
+        self.__last_draw_time = 0
+        # operation id -> [start, rectangle id, label id or None]
+        self.__items = [None] * instance.operations_no
+
+        self.__win = GraphWin(self.__title(length), WINDOW_DIM_X, WINDOW_DIM_Y, autoflush=False)
+        self.__win.setBackground(TRANSPARENT)
+        for machine_id in range(machines_no):
+            x, y, text = machine_label(machine_id, self.__machine_height)
+            self.__win.create_text(x, y, text=text, fill=MACHINE_LABEL_COLOUR, font=FONT)
+        self.__create_steps(take_snapshot(queues))
+        self.__win.flush()
+
+    def __title(self, length):
+        return f'{self.__name} - Length = {length}'
+
+    def __create_steps(self, snapshot):
+        """Creates the rectangles of the steps with their labels (only the ones which fit their rectangles).
+        """
+        win = self.__win
+        fits = label_fits(win)
+        for job_id, step_no, machine_id, start, duration in snapshot:
+            x1, y1, x2, y2 = step_rectangle(machine_id, start, duration, self.__machine_height,
+                                            self.single_time_unit_width)
+            rectangle = win.create_rectangle(x1, y1, x2, y2, fill=job_colour(job_id))
+            label = None
+            text = step_label(job_id, step_no)
+            if fits(text, x2 - x1):
+                label = win.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=text, fill=STEP_LABEL_COLOUR, font=FONT)
+            self.__items[self.__instance.job_offsets[job_id] + step_no] = [start, rectangle, label]
+
+    def __draw(self, starts, length):
+        """Moves the steps whose start (starts indexed by operation id) changed since the last drawing.
+        Returns the number of the steps moved.
+        """
+        win = self.__win
+        moved = 0
+        for item, start in zip(self.__items, starts):
+            if item[0] != start:
+                dx = (start - item[0]) * self.single_time_unit_width
+                win.move(item[1], dx, 0)
+                if item[2] is not None:
+                    win.move(item[2], dx, 0)
+                item[0] = start
+                moved += 1
+        win.master.title(self.__title(length))
+        win.flush()
+        return moved
+
+    def on_best(self, queues, length):
+        """Keeps the new best schedule as the one to be drawn next (called by the search).
+        """
+        with self.__lock:
+            copy_starts(self.__instance, queues, self.__pending)
+            self.__pending_length = length
+
+    def __draw_pending(self):
+        """Draws the latest best schedule (if any and if the interval has passed since the last drawing) and handles
+        the window events, unless the window was closed.
+        """
+        if self.__win.isClosed():
+            return
+        now = time.perf_counter()
+        if now - self.__last_draw_time >= self.__interval:
+            with self.__lock:
+                length = self.__pending_length
+                if length is not None:
+                    self.__pending, self.__drawn = self.__drawn, self.__pending
+                    self.__pending_length = None
+            if length is not None:
+                self.__last_draw_time = now
+                self.__draw(self.__drawn, length)
+        self.__win.update()
+
+    def run(self, search):
+        """Runs the search (function without arguments) in a background thread, drawing its best schedules meanwhile.
+        Returns the result of the search.
+        """
+        results = []
+        errors = []
+        def target():
+            try:
+                results.append(search())
+            except BaseException as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        while thread.is_alive():
+            self.__draw_pending()
+            thread.join(POLL_INTERVAL)
+        if errors:
+            raise errors[0]
+        return results[0]
+
+    def show(self, queues, length):
+        """Draws the schedule and waits until the window is clicked on or closed.
+        """
+        if self.__win.isClosed():
+            return
+        copy_starts(self.__instance, queues, self.__drawn)
+        self.__draw(self.__drawn, length)
+        try:
+            self.__win.getMouse()
+            self.__win.close()
+        except GraphicsError:
+            # closed instead of clicked on
+            pass
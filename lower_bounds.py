@@ -0,0 +1,83 @@
+"""Lower bounds of the makespan.
+
+Used to prove a schedule optimal (its makespan equals the bound) and to report the optimality gap.
+"""
+
+import heapq
+import math
+
+def job_heads_tails(instance):
+    """Returns the heads (total duration of the earlier steps of the job) and the tails (total duration of the
+    later steps of the job) of the operations, indexed by operation id.
+    """
+    heads = [0] * instance.operations_no
+    tails = [0] * instance.operations_no
+    for job in range(instance.jobs_no):
+        first, last = instance.job_offsets[job], instance.job_offsets[job + 1]
+        total = 0
+        for operation in range(first, last):
+            heads[operation] = total
+            total += instance.duration[operation]
+        for operation in range(first, last):
+            tails[operation] = total - heads[operation] - instance.duration[operation]
+    return heads, tails
+
+def job_bound(instance):
+    """Returns the length of the longest job.
+    """
+    return max((sum(instance.duration[instance.job_offsets[job]:instance.job_offsets[job + 1]])
+                for job in range(instance.jobs_no)), default=0)
+
+def machine_bound(instance):
+    """Returns the load of the most loaded machine.
+    """
+    loads = [0] * instance.machines_no
+    for operation in range(instance.operations_no):
+        loads[instance.machine_id[operation]] += instance.duration[operation]
+    return max(loads, default=0)
+
+def jackson_bound(instance):
+    """Returns the highest makespan of the one-machine problems with the heads as the release times and the tails
+    as the delivery times, every one solved exactly with preemptions by the Jackson's schedule
+    (the available operation with the longest tail is processed first).
+    """
+    heads, tails = job_heads_tails(instance)
+    machine_operations = [[] for _ in range(instance.machines_no)]
+    for operation in range(instance.operations_no):
+        machine_operations[instance.machine_id[operation]].append(operation)
+
+    bound = 0
+    for operations in machine_operations:
+        operations.sort(key=lambda operation: heads[operation])
+        time = 0
+        index = 0
+        # (-tail, remaining duration)
+        available = []
+        while index < len(operations) or available:
+            if not available:
+                time = max(time, heads[operations[index]])
+            while index < len(operations) and heads[operations[index]] <= time:
+                operation = operations[index]
+                heapq.heappush(available, (-tails[operation], instance.duration[operation]))
+                index += 1
+            negative_tail, remaining = heapq.heappop(available)
+            next_release = heads[operations[index]] if index < len(operations) else math.inf
+            processed = min(remaining, next_release - time)
+            time += processed
+            if processed < remaining:
+                heapq.heappush(available, (negative_tail, remaining - processed))
+            else:
+                bound = max(bound, time - negative_tail)
+    return bound
+
+def lower_bound(instance):
+    """Returns the best of the lower bounds.
+    """
+    return max(job_bound(instance), machine_bound(instance), jackson_bound(instance))
+
+def optimality_gap(length, bound):
+    """Returns the relative gap (in percent) between the length and the lower bound.
+    """
+    if bound <= 0:
+        return 0.0
+    return 100 * (length - bound) / bound
@@ -4,13 +4,30 @@ import time
 import math
 import argparse
 import copy
+import multiprocessing
+import sys
+import os
+import cProfile
+import pstats
+from concurrent.futures import ProcessPoolExecutor, wait
 
-from graphical_representation import draw_chart
 from step import Step
+from schedule import Schedule
+from array_schedule import ArraySchedule
+from disjunctive_graph import DisjunctiveGraph
+from tabu_search import TabuSearch
+from parallel_tempering import parallel_tempering
+from island_model import island_model
+from giffler_thompson import giffler_thompson, generate_active_neighbour
+from dispatching_rules import RULES, dispatch, dispatch_all
+from lower_bounds import lower_bound, optimality_gap
+from stopping_rules import StoppingRules
+from instance_loader import load_instance
+from checkpoint import dump_schedule, load_schedule, save_checkpoint, load_checkpoint
+from progress_reporter import ProgressReporter
+from phase_timers import PhaseTimers
 from annealing import Annealing
 
-random.seed(time.clock())
-
 DEFAULT_ITERATIONS_NUMBER       = 50_000
 DEFAULT_INITIAL_TEMPERATURE     = 50
 DEFAULT_TEMPERATURE_UPDATE      = 'linear'
@@ -18,27 +35,190 @@ DEFAULT_FILE_NAME               = 'testdata/2/tai15x15_1.csv'
 DEFAULT_DECAY_CONSTANT          = 0.8
 DEFAULT_GRADUAL_CONSTANT_A      = 30_000
 DEFAULT_GRADUAL_CONSTANT_N      = 2
-
-def get_cmd_arguments():
-    """Parses commandline arguments and provides help when used in shell.
+DEFAULT_REPRESENTATION          = 'arrays'
+DEFAULT_NEIGHBOURHOOD           = 'shift'
+DEFAULT_CANDIDATES              = 1
+DEFAULT_INITIAL_SCHEDULE        = 'dispatching'
+DEFAULT_ENGINE                  = 'annealing'
+DEFAULT_SEARCH_NEIGHBOURHOOD    = 'n5'
+DEFAULT_TABU_TENURE             = 8
+DEFAULT_ELITE_SIZE              = 5
+DEFAULT_BACK_JUMP_ITERATIONS    = 1000
+DEFAULT_PERTURBATION_MOVES      = 10
+DEFAULT_WORKERS                 = 1
+DEFAULT_REPLICAS                = 4
+DEFAULT_MIN_TEMPERATURE         = 1
+DEFAULT_MAX_TEMPERATURE         = 50
+DEFAULT_EXCHANGE_INTERVAL       = 100
+DEFAULT_ISLANDS                 = 4
+DEFAULT_MIGRATION_INTERVAL      = 500
+DEFAULT_TARGET_MAKESPAN         = 0
+DEFAULT_CHECKPOINT_INTERVAL     = 10_000
+DEFAULT_REPORT_INTERVAL         = 1.0
+DEFAULT_RENDER                  = 'tk'
+DEFAULT_CHART_FILE              = 'schedule'
+DEFAULT_TK_RENDERING            = 'batched'
+DEFAULT_LIVE_INTERVAL           = 0.5
+DEFAULT_INSTANCE_CACHE          = os.path.join(os.path.expanduser('~'), '.cache', 'job_shop_scheduling')
+
+def get_cmd_arguments(argv=None):
+    """Parses commandline arguments (argv if given) and provides help when used in shell.
 
     Returns parsed arguments object.
     """
     parser = argparse.ArgumentParser(description='Job Shop Scheduling Problem Solver.')
     
     parser.add_argument('-fn', '--file_name', type=str, help=f'Input filename. Default {DEFAULT_FILE_NAME}', default=DEFAULT_FILE_NAME)
+    parser.add_argument('-ic', '--instance_cache', type=str,
+                        help='Directory the parsed instances are cached in (by the hash of the file content), none disables the cache. '
+                        f'Default {DEFAULT_INSTANCE_CACHE}.', default=DEFAULT_INSTANCE_CACHE)
     parser.add_argument('-it', '--initial_temperature', type=int, help=f'Initial temperature value. Default {DEFAULT_INITIAL_TEMPERATURE}.', default=DEFAULT_INITIAL_TEMPERATURE)
     parser.add_argument('-tu', '--temperature_update', type=str, 
                         help=f'Update of temperature. Possible values: linear, decay, gradual, Default: {DEFAULT_TEMPERATURE_UPDATE}', default=DEFAULT_TEMPERATURE_UPDATE)
     parser.add_argument('-in', '--iterations_number', type=int, help=f'Number of iterations. Default {DEFAULT_ITERATIONS_NUMBER}.', default=DEFAULT_ITERATIONS_NUMBER)
+    parser.add_argument('-tl', '--time_limit', type=float,
+                        help='Time limit of the search in seconds. If given, the search ends when the time is over instead of after '
+                        '"iterations_number" iterations and the temperature follows the elapsed fraction of the time limit. Default: none.')
+    parser.add_argument('-tm', '--target_makespan', type=int,
+                        help=f'The search ends when a schedule not longer than this is found (or the lower bound is reached). '
+                        f'Default {DEFAULT_TARGET_MAKESPAN}.', default=DEFAULT_TARGET_MAKESPAN)
+    parser.add_argument('-ms', '--max_stagnation', type=int,
+                        help='The search ends after this number of iterations without a new best schedule. Default: none.')
     parser.add_argument('-dc', '--decay_constant', type=float, 
                         help=f'Decay constant. Relevant if "temperature_update"="decay". Default {DEFAULT_DECAY_CONSTANT}', default=DEFAULT_DECAY_CONSTANT)
     parser.add_argument('-gda', '--gradual_constant_a', type=int, 
                         help=f'Gradual constant a. Relevant if "temperature_update"="gradual". Default {DEFAULT_GRADUAL_CONSTANT_A}.', default=DEFAULT_GRADUAL_CONSTANT_A)
     parser.add_argument('-gcn', '--gradual_constant_n', type=float, 
                         help=f'Gradual constant n. Relevant if "temperature_update"="gradual". Default {DEFAULT_GRADUAL_CONSTANT_N}.', default=DEFAULT_GRADUAL_CONSTANT_N)
-
-    return parser.parse_args()
+    parser.add_argument('-e', '--engine', type=str, choices=['annealing', 'tabu', 'tempering', 'islands'],
+                        help=f'Search engine. Possible values: annealing, tabu, tempering (parallel tempering), islands (island model). '
+                        f'Default: {DEFAULT_ENGINE}', default=DEFAULT_ENGINE)
+    parser.add_argument('-r', '--representation', type=str, choices=['steps', 'arrays'],
+                        help=f'Schedule representation. Possible values: steps (the original one, its shift neighbour refills the steps after the moved one), '
+                        f'arrays (required by the other engines than annealing and by the other neighbourhoods than shift). Default: {DEFAULT_REPRESENTATION}.',
+                        default=DEFAULT_REPRESENTATION)
+    parser.add_argument('-is', '--initial_schedule', type=str, choices=['fill', 'active', 'dispatching', *RULES],
+                        help=f'Initial schedule. Possible values: fill (steps squeezed in the input order), active (Giffler-Thompson in the input order), '
+                        f'{", ".join(RULES)} (dispatching rules), dispatching (the best of the dispatching rules, built in parallel if "workers" > 1). '
+                        f'Default: {DEFAULT_INITIAL_SCHEDULE} (fill for the shift neighbourhood, which improves the fill schedule more than the dispatching ones, '
+                        'and whose steps representation refills the steps in the input order, losing any better initial schedule)')
+    parser.add_argument('-nb', '--neighbourhood', type=str, choices=['shift', 'active', 'n1', 'n5', 'n6'],
+                        help=f'Neighbourhood. Possible values: shift (random step moved to the left: with "representation"="arrays" in its machine queue, '
+                        f'before the steps that start after its job predecessor ends, re-timing only the affected steps; with "representation"="steps" '
+                        f'to the end of its job predecessor, refilling the following steps in the input order), active (machine neighbours swapped in the '
+                        f'priorities of the Giffler-Thompson decoder), n1, n5, n6 (moves on the critical blocks). The others than shift '
+                        f'require "representation"="arrays". Default: {DEFAULT_NEIGHBOURHOOD} ({DEFAULT_SEARCH_NEIGHBOURHOOD} for the other engines)')
+    parser.add_argument('-c', '--candidates', type=int,
+                        help=f'Number of random moves whose makespan is estimated in every iteration (0 for all the moves), only the best one is decoded. '
+                        f'Relevant if "neighbourhood" is n1, n5 or n6. Default {DEFAULT_CANDIDATES}.', default=DEFAULT_CANDIDATES)
+
+    parser.add_argument('-tt', '--tabu_tenure', type=int,
+                        help=f'Length of the tabu list. Relevant if "engine"="tabu". Default {DEFAULT_TABU_TENURE}.', default=DEFAULT_TABU_TENURE)
+    parser.add_argument('-es', '--elite_size', type=int,
+                        help=f'Number of elite solutions kept for the back jumps. Relevant if "engine"="tabu". Default {DEFAULT_ELITE_SIZE}.', default=DEFAULT_ELITE_SIZE)
+    parser.add_argument('-bji', '--back_jump_iterations', type=int,
+                        help=f'Number of iterations without improvement after which the search jumps back to an elite solution. '
+                        f'Relevant if "engine"="tabu". Default {DEFAULT_BACK_JUMP_ITERATIONS}.', default=DEFAULT_BACK_JUMP_ITERATIONS)
+    parser.add_argument('-pm', '--perturbation_moves', type=int,
+                        help=f'Number of random moves applied to the best schedule when the search restarts (after all the elite solutions were used). '
+                        f'Relevant if "engine"="tabu". Default {DEFAULT_PERTURBATION_MOVES}.', default=DEFAULT_PERTURBATION_MOVES)
+    parser.add_argument('-w', '--workers', type=int,
+                        help=f'Number of independent annealing runs performed in parallel processes. Default {DEFAULT_WORKERS}.', default=DEFAULT_WORKERS)
+    parser.add_argument('-wtu', '--worker_temperature_updates', type=str, nargs='+', choices=['linear', 'decay', 'gradual'],
+                        help='Updates of temperature used by the workers in turn. Relevant if "workers" > 1. Default: "temperature_update" for all of them.')
+    parser.add_argument('-rn', '--replicas', type=int,
+                        help=f'Number of chains (and processes). Relevant if "engine"="tempering". Default {DEFAULT_REPLICAS}.', default=DEFAULT_REPLICAS)
+    parser.add_argument('-mit', '--min_temperature', type=float,
+                        help=f'Temperature of the coldest chain. Relevant if "engine"="tempering". Default {DEFAULT_MIN_TEMPERATURE}.', default=DEFAULT_MIN_TEMPERATURE)
+    parser.add_argument('-mat', '--max_temperature', type=float,
+                        help=f'Temperature of the hottest chain. Relevant if "engine"="tempering". Default {DEFAULT_MAX_TEMPERATURE}.', default=DEFAULT_MAX_TEMPERATURE)
+    parser.add_argument('-ei', '--exchange_interval', type=int,
+                        help=f'Number of iterations between the exchanges of the temperatures. Relevant if "engine"="tempering". '
+                        f'Default {DEFAULT_EXCHANGE_INTERVAL}.', default=DEFAULT_EXCHANGE_INTERVAL)
+    parser.add_argument('-isl', '--islands', type=int,
+                        help=f'Number of islands (and processes). Relevant if "engine"="islands". Default {DEFAULT_ISLANDS}.', default=DEFAULT_ISLANDS)
+    parser.add_argument('-mi', '--migration_interval', type=int,
+                        help=f'Number of iterations between the migrations. Relevant if "engine"="islands". '
+                        f'Default {DEFAULT_MIGRATION_INTERVAL}.', default=DEFAULT_MIGRATION_INTERVAL)
+    parser.add_argument('-s', '--seed', type=int, help='Seed of the random number generator. Default: random seed.')
+
+    parser.add_argument('-ri', '--report_interval', type=float,
+                        help=f'Number of seconds between the progress reports. Default {DEFAULT_REPORT_INTERVAL}.', default=DEFAULT_REPORT_INTERVAL)
+    parser.add_argument('-rit', '--report_iterations', type=int,
+                        help='Number of iterations between the progress reports (instead of "report_interval"). Default: none.')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='Print neither the progress nor the new best solutions, only the results.')
+    parser.add_argument('-ef', '--events_file', type=str,
+                        help='File the events (new best solutions, progress with the acceptance rate, temperature and iterations '
+                        'per second) are written to as JSON lines, - for the standard output (the text is printed to the standard error then). Default: none.')
+    parser.add_argument('-ti', '--timers', action='store_true',
+                        help='Measure the calls and the time of the phases of the search (in the main process) and print them at the end.')
+    parser.add_argument('-pr', '--profile', type=str,
+                        help='Run under cProfile, dump the statistics to this file and print the most expensive functions. Default: none.')
+    parser.add_argument('-cf', '--checkpoint_file', type=str,
+                        help='File the state of the annealing is saved to every "checkpoint_interval" iterations. '
+                        'Possible only with "engine"="annealing" and a single worker. Default: none.')
+    parser.add_argument('-ci', '--checkpoint_interval', type=int,
+                        help=f'Number of iterations between the checkpoints. Default {DEFAULT_CHECKPOINT_INTERVAL}.', default=DEFAULT_CHECKPOINT_INTERVAL)
+    parser.add_argument('-re', '--resume', action='store_true',
+                        help='Resume the annealing saved in "checkpoint_file" (with its arguments).')
+    parser.add_argument('-rd', '--render', type=str, choices=['svg', 'tk', 'none'],
+                        help='Rendering of the initial and final chart: svg saves them to files (and to PNG files if Pillow is installed) '
+                        f'without a display, tk shows them in windows (waiting for a click), none skips them. Default {DEFAULT_RENDER}.',
+                        default=DEFAULT_RENDER)
+    parser.add_argument('-chf', '--chart_file', type=str,
+                        help='Prefix of the chart files (followed by _initial or _final). Relevant if "render"="svg". '
+                        f'Default {DEFAULT_CHART_FILE}.', default=DEFAULT_CHART_FILE)
+    parser.add_argument('-tkr', '--tk_rendering', type=str, choices=['batched', 'objects'],
+                        help='Drawing of the charts in the windows: batched creates all the canvas items at once and skips the labels that '
+                        'do not fit their steps, objects draws them one by one. Relevant if "render"="tk". '
+                        f'Default {DEFAULT_TK_RENDERING}.', default=DEFAULT_TK_RENDERING)
+    parser.add_argument('-lv', '--live', action='store_true',
+                        help='Show the chart in a single window following the best schedule during the search. '
+                        'Possible only with "render"="tk" and "engine"="annealing" with a single worker or "engine"="tabu".')
+    parser.add_argument('-lvi', '--live_interval', type=float,
+                        help=f'Minimal number of seconds between the redrawings of the live chart. Default {DEFAULT_LIVE_INTERVAL}.',
+                        default=DEFAULT_LIVE_INTERVAL)
+
+    args = parser.parse_args(argv)
+    if args.instance_cache == 'none':
+        args.instance_cache = None
+    if args.engine != 'annealing':
+        if args.neighbourhood is None:
+            args.neighbourhood = DEFAULT_SEARCH_NEIGHBOURHOOD
+        if args.representation != 'arrays':
+            parser.error(f'engine {args.engine} requires "representation"="arrays"')
+        if args.engine == 'tabu' and args.neighbourhood in ('shift', 'active'):
+            parser.error('engine tabu requires neighbourhood n1, n5 or n6')
+    elif args.neighbourhood is None:
+        args.neighbourhood = DEFAULT_NEIGHBOURHOOD
+    if args.initial_schedule is None:
+        args.initial_schedule = 'fill' if args.neighbourhood == 'shift' else DEFAULT_INITIAL_SCHEDULE
+    if args.neighbourhood != 'shift' and args.representation != 'arrays':
+        parser.error(f'neighbourhood {args.neighbourhood} requires "representation"="arrays"')
+    if args.checkpoint_file is not None and (args.engine != 'annealing' or args.workers > 1):
+        parser.error('checkpoints require "engine"="annealing" and a single worker')
+    if args.resume and args.checkpoint_file is None:
+        parser.error('resume requires "checkpoint_file"')
+    if args.live and (args.render != 'tk' or args.engine not in ('annealing', 'tabu') or args.workers > 1):
+        parser.error('live chart requires "render"="tk" and "engine"="annealing" with a single worker or "engine"="tabu"')
+
+    return args
+
+def draw_chart(args, queues, machines_no, jobs_no, length, stage, single_time_unit_width=0, name=''):
+    """Renders the chart of the schedule at the stage (initial or final) as given by args.render.
+    The graphics are imported only when a chart is drawn in a window, since they require a display.
+    Returns single time unit width.
+    """
+    if args.render == 'none':
+        return single_time_unit_width
+    if args.render == 'svg':
+        from image_chart import save_chart
+        return save_chart(queues, machines_no, jobs_no, length, f'{args.chart_file}_{stage}',
+                            single_time_unit_width=single_time_unit_width, name=name)
+    from graphical_representation import draw_chart
+    return draw_chart(queues, machines_no, jobs_no, length, single_time_unit_width=single_time_unit_width, name=name,
+                        batched=args.tk_rendering == 'batched')
 
 def print_queues(queues):
     """Prints machine queues and max length.
@@ -59,6 +239,9 @@ def print_queues(queues):
 def get_total_length(queues):
     """Returns max (queue) length.
     """
+    if isinstance(queues, (Schedule, ArraySchedule)):
+        return queues.makespan
+
     max_length = 0
     for queue in queues:
         for step in queue:
@@ -76,45 +259,17 @@ def print_jobs(jobs):
             print(f'M: {step.machine_id} D: {step.duration}; {step.job_id}/{step.step_no}\t', end='')
         print('')
 
-def _contained(queue, step):
-    """True if queue contains step.
-    """
-    for _step in queue:
-        if step.job_id == _step.job_id and step.step_no == _step.step_no:
-            return True
-    return False
-
-def initialize_queues(machines_no):
+def initialize_queues(machines_no, jobs_no):
     """Initializes empty queues.
-    Returns empty queues.
+    Returns empty schedule.
     """
-    queues = []
-    for i in range(machines_no):
-        queues.append([])
-
-    return queues
+    return Schedule(machines_no, jobs_no)
 
 def find_step(queues, job_id, step_no):
     """Finds step in queues given job_id and step_no.
     Returns found step.
     """
-    for queue in queues:
-        for step in queue:
-            if step.job_id == job_id and step.step_no == step_no:
-                return step
-
-def find_ending(queues, job_id):
-    """Finds the timepoint when job with given job_id ends.
-    Returns timepoint.
-    """
-    ending = 0
-    for queue in queues:
-        for step in queue:
-            if step.job_id == job_id:
-                if ending < step.stop:
-                    ending = step.stop
-    
-    return ending
+    return queues.find(job_id, step_no)
 
 def random_step(queues, machines_no):
     """Returns random step from the queues.
@@ -184,6 +339,13 @@ def read_csv_2(file_name, print_info=False):
 
         return jobs, jobs_no, machines_no
 
+def read_instance(file_name, cache_dir=DEFAULT_INSTANCE_CACHE, steps=True):
+    """Reads the instance from the file in any supported format (see instance_loader), using the cache in cache_dir
+    (none if None). The list of jobs (lists of steps) is created only if steps.
+    Returns instance, jobs (None unless steps).
+    """
+    return load_instance(file_name, cache_dir=cache_dir, steps=steps)
+
 def fill_machine_queues(jobs, queues, single_time_unit_width=0):
     """Fills the queues with the remaining steps.
     Queues can be already containing some steps. Only those who are not already in queues are added.
@@ -194,13 +356,13 @@ def fill_machine_queues(jobs, queues, single_time_unit_width=0):
         for step in job:
             
             # if it's already contained, don't consider it anymore
-            if _contained(queues[step.machine_id], step):
+            if queues.contains(step.job_id, step.step_no):
                 continue            
             
             step_copy = step.copy()
 
             squeezed = False
-            job_ending = find_ending(queues, step_copy.job_id)
+            job_ending = queues.job_ending(step_copy.job_id)
 
             # the previous step of the job ended before the machine is free
             # try to squeeze it
@@ -228,7 +390,7 @@ def fill_machine_queues(jobs, queues, single_time_unit_width=0):
 
                             step_copy.stop = step_copy.start + step_copy.duration
                             _step.time_before = _step.start - step_copy.stop # TODO: tu powinny być kopie więc powinienem móc na czillu updateowac
-                            queues[step.machine_id].insert(count, step_copy)
+                            queues.insert(step.machine_id, count, step_copy)
                             break            
 
             if not squeezed:
@@ -248,7 +410,7 @@ def fill_machine_queues(jobs, queues, single_time_unit_width=0):
                         step_copy.time_before = 0
 
                 step_copy.stop = step_copy.start + step_copy.duration
-                queues[step.machine_id].append(step_copy)
+                queues.append(step.machine_id, step_copy)
 
     return queues
 
@@ -261,7 +423,7 @@ def generate_neighbour(queues, machines_no, jobs, single_time_unit_width=0):
 
     # move it as much to the left as possible
     step = queues[machine_id][step_no]    
-    new_queues = initialize_queues(machines_no)
+    new_queues = initialize_queues(machines_no, len(jobs))
 
     if step.step_no == 0:
         # if this is the first step to do, just put it on the beginning
@@ -269,7 +431,7 @@ def generate_neighbour(queues, machines_no, jobs, single_time_unit_width=0):
         new_step.time_before = 0
         new_step.start = 0
         new_step.stop = new_step.start + new_step.duration
-        new_queues[machine_id].append(new_step)
+        new_queues.append(machine_id, new_step)
 
     else: 
         previous_step = find_step(queues, step.job_id, step.step_no - 1)
@@ -278,7 +440,7 @@ def generate_neighbour(queues, machines_no, jobs, single_time_unit_width=0):
         for _machine_id, queue in enumerate(queues):
             for _step in queue:
                 if _step.stop <= previous_step.stop:
-                    new_queues[_machine_id].append(_step.copy())
+                    new_queues.append(_machine_id, _step.copy())
 
         machine_ending = 0
         if new_queues[machine_id]:
@@ -290,71 +452,392 @@ def generate_neighbour(queues, machines_no, jobs, single_time_unit_width=0):
         step_copy.time_before = step_copy.start - machine_ending
         step_copy.stop = step_copy.start + step_copy.duration
 
-        new_queues[machine_id].append(step_copy)
-
-        new_queues_length = get_total_length(new_queues)
-        final_queues_length = get_total_length(queues)
+        new_queues.append(machine_id, step_copy)
 
     return fill_machine_queues(jobs, new_queues, single_time_unit_width=single_time_unit_width)
 
 
-if __name__ == '__main__':
-
-    jobs = []
-    jobs_no = 0
-    machines_no = 0
+def queues_from_array_schedule(schedule):
+    """Converts the array schedule to the queues of steps.
+    Returns queues.
+    """
+    queues = initialize_queues(schedule.instance.machines_no, schedule.instance.jobs_no)
+    for machine_id, steps in enumerate(schedule):
+        for step in steps:
+            queues.append(machine_id, step)
+    return queues
 
-    args = get_cmd_arguments()
+def initial_schedule(args, instance, jobs, reporter=None):
+    """Builds the initial schedule given by args.initial_schedule in args.representation.
+    The lengths of the dispatching rules are printed by the reporter (if given).
+    Returns initial schedule.
+    """
+    if args.initial_schedule == 'dispatching':
+        results = dispatch_all(instance, workers=args.workers)
+        if reporter is not None:
+            for rule, schedule in results:
+                reporter.message(f'Dispatching rule {rule}: length {schedule.makespan}')
+        queues = results[0][1]
+    elif args.initial_schedule in RULES:
+        queues = dispatch(instance, args.initial_schedule)
+    elif args.initial_schedule == 'active':
+        queues = giffler_thompson(instance, range(instance.operations_no))
+
+    if args.initial_schedule != 'fill':
+        if args.representation == 'arrays':
+            return queues
+        return queues_from_array_schedule(queues)
+
+    if args.representation == 'arrays':
+        return ArraySchedule(instance).fill()
+    initial_queues = initialize_queues(instance.machines_no, instance.jobs_no)
+    return fill_machine_queues(jobs, initial_queues)
+
+def get_stopping_rules(args):
+    """Returns the stopping rules given by args, the target makespan is at least the lower bound.
+    """
+    return StoppingRules(iterations_number=args.iterations_number,
+                            time_limit=args.time_limit,
+                            target_makespan=max(args.target_makespan, args.lower_bound),
+                            max_stagnation=args.max_stagnation)
 
+def save_annealing_checkpoint(args, step, queues, best_queues, annealing, stopping_rules):
+    """Saves the state of the annealing before the step to args.checkpoint_file.
+    """
+    save_checkpoint(args.checkpoint_file, {
+        'args'              : vars(args),
+        'step'              : step,
+        'queues'            : dump_schedule(queues),
+        'best_queues'       : dump_schedule(best_queues),
+        'annealing'         : annealing.get_state(),
+        'stopping_rules'    : stopping_rules.get_state(),
+        'random_state'      : random.getstate()
+    })
+
+def anneal(args, queues, jobs, machines_no, single_time_unit_width=0, reporter=None, on_best=None, stop=None,
+            checkpoint=None):
+    """Performs the simulated annealing starting from given schedule, until the stopping rules given by args
+    end it or the stop event (if given) is set.
+    The state is saved to args.checkpoint_file (if given) every args.checkpoint_interval iterations,
+    the annealing continues from the checkpoint (if given) exactly where it was saved.
+    The progress is reported by the reporter (if given).
+    on_best is called with every new best schedule and its length (the array schedule gets overwritten later,
+    so it has to be copied to be kept).
+    Returns the best schedule found and its length.
+    """
+    stopping_rules = get_stopping_rules(args)
     annealing = Annealing(initial_temperature=args.initial_temperature, 
                             temperature_update=args.temperature_update, 
                             iterations_number=args.iterations_number, 
                             decay_constant=args.decay_constant, 
                             gradual_constant_a=args.gradual_constant_a, 
-                            gradual_constant_n=args.gradual_constant_n)
+                            gradual_constant_n=args.gradual_constant_n,
+                            stopping_rules=stopping_rules)
+    length = get_total_length(queues)
+    best_queues = queues
+    best_length = length
+
+    graph = None
+    if args.representation == 'arrays':
+        # the neighbours are generated into the spare schedule, so no schedule is allocated in the loop
+        spare_queues = ArraySchedule(queues.instance)
+        # the current schedule gets overwritten, so the best one is kept aside
+        best_queues = ArraySchedule(queues.instance)
+        best_queues.copy_from(queues)
+
+    step = 0
+    if checkpoint is not None:
+        instance = queues.instance if args.representation == 'arrays' else None
+        step = checkpoint['step']
+        queues = load_schedule(checkpoint['queues'], instance)
+        best_queues = load_schedule(checkpoint['best_queues'], instance)
+        length = get_total_length(queues)
+        best_length = get_total_length(best_queues)
+        annealing.set_state(checkpoint['annealing'])
+        stopping_rules.start(**checkpoint['stopping_rules'])
+        random.setstate(checkpoint['random_state'])
+        if reporter is not None:
+            reporter.message(f'Resumed at the iteration {step} with length: {length} (best: {best_length})')
+    first_step = step
+    accepted_no = 0
+
+    if args.representation == 'arrays' and args.neighbourhood not in ('shift', 'active'):
+        graph = DisjunctiveGraph(queues.instance, neighbourhood=args.neighbourhood).update(queues)
+
+    while not stopping_rules.is_over(step, best_length):
+
+        if stop is not None and stop.is_set():
+            break
+
+        if args.checkpoint_file is not None and step % args.checkpoint_interval == 0 and step > first_step:
+            save_annealing_checkpoint(args, step, queues, best_queues, annealing, stopping_rules)
+
+        # worse solutions are accepted if they are shorter than this length (their probability is higher than a random number)
+        threshold = annealing.calculate_threshold(length)
+
+        if args.representation == 'arrays':
+            if args.neighbourhood == 'active':
+                new_queues = generate_active_neighbour(queues, spare_queues)
+            elif graph is None:
+                new_queues = queues.generate_neighbour(spare_queues)
+            else:
+                # moves estimated above this length would be rejected anyway, so they are not decoded
+                new_queues = graph.generate_neighbour(queues, spare_queues, candidates=args.candidates, limit=threshold)
+        else:
+            new_queues = generate_neighbour(queues, machines_no, jobs, single_time_unit_width=single_time_unit_width)
+
+        accepted = False
+        if new_queues is not None:
+            new_length = get_total_length(new_queues)
+
+            if length > new_length:
+                accepted = True
+
+            elif new_length == length:
+                # the critical-block neighbourhoods are small, moving on a plateau keeps the chain from freezing
+                accepted = graph is not None
+
+            elif new_length > length:
+
+                if new_length < threshold:
+                    # also accept it
+                    accepted = True
+
+        if accepted:
+            if args.representation == 'arrays':
+                # the replaced schedule is overwritten by the next neighbour
+                spare_queues = queues
+            queues = new_queues
+            length = new_length
+            accepted_no += 1
+            if graph is not None:
+                graph.update(queues)
+
+            if length < best_length:
+                best_length = length
+                if args.representation == 'arrays':
+                    best_queues.copy_from(queues)
+                else:
+                    best_queues = queues
+                stopping_rules.improved(step)
+                if reporter is not None:
+                    reporter.improved(step, best_length)
+                if on_best is not None:
+                    on_best(best_queues, best_length)
 
-    if args.file_name.split('/')[1] == '1':
-        jobs, jobs_no, machines_no = read_csv(args.file_name)
-    else:
-        jobs, jobs_no, machines_no = read_csv_2(args.file_name)
+        annealing.update_iteration()
+        step += 1
+        if reporter is not None and step >= reporter.next_iteration:
+            reporter.report(step, stopping_rules.progress(step), accepted_no=accepted_no,
+                            temperature=annealing.get_temperature(), length=length, best_length=best_length)
 
+    return best_queues, best_length
 
-    initial_queues = initialize_queues(machines_no)
+def instrument_phases(timers):
+    """Instruments the phases of the searches with the timers.
+    """
+    timers.instrument(sys.modules[__name__], ['random_step', 'find_step', 'generate_neighbour', 'fill_machine_queues',
+                                                'get_total_length', 'generate_active_neighbour'])
+    timers.instrument(sys.modules['giffler_thompson'], ['giffler_thompson'])
+    timers.instrument(Step, ['copy'])
+    timers.instrument(Annealing, ['calculate_probability', 'calculate_threshold', 'update_iteration'])
+    timers.instrument(ArraySchedule, ['generate_neighbour', 'copy_from', 'move', 'retime', 'set_sequence'])
+    timers.instrument(DisjunctiveGraph, ['update', 'generate_neighbour'])
+
+def anneal_worker(args, queues, jobs, machines_no, worker_id, seed, progress):
+    """Performs single annealing run of the multistart in a worker process.
+    Every new best length is put to the progress queue together with the worker_id.
+    Returns worker_id, the best schedule found and its length.
+    """
+    random.seed(seed)
+    queues, length = anneal(args, queues, jobs, machines_no,
+                            on_best=lambda best_queues, best_length: progress.put((worker_id, best_length)),
+                            stop=target_reached)
+    if get_stopping_rules(args).is_reached(length):
+        target_reached.set()
+    return worker_id, queues, length
+
+def init_worker(event):
+    """Initializes the worker process of the multistart with the event set when the target makespan is reached
+    (the events can be passed to the processes only when they are created).
+    """
+    global target_reached
+    target_reached = event
 
-    queues = fill_machine_queues(jobs, initial_queues)
+def multistart(args, queues, jobs, machines_no, reporter):
+    """Performs args.workers independent annealing runs (with different seeds) in parallel processes,
+    starting from given schedule. Reports new best lengths of the workers as they are found.
+    Returns the best schedule found and its length.
+    """
+    if args.seed is not None:
+        seeds = [args.seed + worker_id for worker_id in range(args.workers)]
+    else:
+        seeds = [random.randrange(2 ** 32) for worker_id in range(args.workers)]
+
+    event = multiprocessing.Event()
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                                                    initargs=(event,)) as executor:
+        progress = manager.Queue()
+        futures = []
+        for worker_id in range(args.workers):
+            worker_args = copy.copy(args)
+            if args.worker_temperature_updates:
+                updates = args.worker_temperature_updates
+                worker_args.temperature_update = updates[worker_id % len(updates)]
+            futures.append(executor.submit(anneal_worker, worker_args, queues, jobs, machines_no,
+                                            worker_id, seeds[worker_id], progress))
+
+        best_length = get_total_length(queues)
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=0.1)
+            while not progress.empty():
+                worker_id, length = progress.get()
+                if length < best_length:
+                    best_length = length
+                    reporter.improved(None, length, source=f'Worker {worker_id}')
+
+        results = [future.result() for future in futures]
+
+    _, queues, length = min(results, key=lambda result: result[2])
+    return queues, length
+
+def search(args, instance, queues, jobs, machines_no, reporter, single_time_unit_width=0, checkpoint=None, on_best=None):
+    """Searches for a better schedule than the given one with the engine given by args.
+    on_best is called with every new best schedule and its length, it is supported only by the single-process
+    engines (tabu, annealing with a single worker), the others do not pass their schedules to this process.
+    Returns the best schedule found and its length.
+    """
+    if on_best is not None and (args.engine in ('tempering', 'islands') or (args.engine == 'annealing' and args.workers > 1)):
+        raise ValueError('on_best requires "engine"="annealing" with a single worker or "engine"="tabu"')
     length = get_total_length(queues)
-    single_time_unit_width = draw_chart(queues, machines_no, jobs_no, length, 
-                                        name=f'Initial schedule - Length = {length}')
-
-    print(f'Initial length: {length}')
+    if get_stopping_rules(args).is_reached(length):
+        reporter.message('Initial schedule reaches the target makespan, no search needed.')
+    elif args.engine == 'tabu':
+        tabu_search = TabuSearch(instance, neighbourhood=args.neighbourhood,
+                                    stopping_rules=get_stopping_rules(args),
+                                    tabu_tenure=args.tabu_tenure,
+                                    elite_size=args.elite_size,
+                                    back_jump_iterations=args.back_jump_iterations,
+                                    perturbation_moves=args.perturbation_moves,
+                                    lower_bound=args.lower_bound)
+        queues = tabu_search.search(queues, reporter=reporter, on_best=on_best)
+        length = get_total_length(queues)
+    elif args.engine == 'tempering':
+        queues = parallel_tempering(queues, replicas_no=args.replicas,
+                                    min_temperature=args.min_temperature,
+                                    max_temperature=args.max_temperature,
+                                    stopping_rules=get_stopping_rules(args),
+                                    exchange_interval=args.exchange_interval,
+                                    neighbourhood=args.neighbourhood,
+                                    lower_bound=args.lower_bound,
+                                    seed=args.seed, reporter=reporter)
+        length = get_total_length(queues)
+    elif args.engine == 'islands':
+        annealing_parameters = {'initial_temperature' : args.initial_temperature,
+                                'temperature_update'  : args.temperature_update,
+                                'decay_constant'      : args.decay_constant,
+                                'gradual_constant_a'  : args.gradual_constant_a,
+                                'gradual_constant_n'  : args.gradual_constant_n}
+        queues = island_model(queues, islands_no=args.islands,
+                                stopping_rules=get_stopping_rules(args),
+                                migration_interval=args.migration_interval,
+                                neighbourhood=args.neighbourhood,
+                                annealing_parameters=annealing_parameters,
+                                lower_bound=args.lower_bound,
+                                seed=args.seed, reporter=reporter)
+        length = get_total_length(queues)
+    elif args.workers > 1:
+        queues, length = multistart(args, queues, jobs, machines_no, reporter)
+    else:
+        queues, length = anneal(args, queues, jobs, machines_no, single_time_unit_width=single_time_unit_width,
+                                reporter=reporter, on_best=on_best, checkpoint=checkpoint)
 
-    for step in range(args.iterations_number):
+    return queues, length
 
-        new_queues = generate_neighbour(queues, machines_no, jobs, single_time_unit_width=single_time_unit_width)
-     
-        new_length = get_total_length(new_queues)
-      
-        if length > new_length:
-            print(f'A better solution found with length: {new_length}\r')
-            length = new_length
-            queues = new_queues
 
-        elif new_length > length: 
+if __name__ == '__main__':
 
-            probability = annealing.calculate_probability(length, new_length)
-            if probability > random.random():
-                # also accept it                
-                print(f'Accepted worse solution with the probability of {probability}\r')
-                print(f'New length is: {new_length}\r')
+    jobs = []
+    jobs_no = 0
+    machines_no = 0
 
-                queues = new_queues
-                length = new_length
+    args = get_cmd_arguments()
+    profiler = None
+    if args.profile is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    checkpoint = None
+    if args.resume:
+        checkpoint = load_checkpoint(args.checkpoint_file)
+        for key, value in checkpoint['args'].items():
+            if key not in ('checkpoint_file', 'checkpoint_interval', 'resume',
+                            'report_interval', 'report_iterations', 'quiet', 'events_file', 'timers', 'profile',
+                            'render', 'chart_file', 'tk_rendering', 'live', 'live_interval'):
+                setattr(args, key, value)
+    random.seed(args.seed)
+
+    instance, jobs = read_instance(args.file_name, cache_dir=args.instance_cache,
+                                    steps=args.representation == 'steps')
+    jobs_no = instance.jobs_no
+    machines_no = instance.machines_no
+
+    args.lower_bound = lower_bound(instance)
+    reporter = ProgressReporter(interval=args.report_interval, interval_iterations=args.report_iterations,
+                                quiet=args.quiet, events_file=args.events_file, lower_bound=args.lower_bound)
+    reporter.result(f'Lower bound: {args.lower_bound}')
+    queues = initial_schedule(args, instance, jobs, reporter=reporter)
 
-        annealing.update_iteration()
-        print(f'{step} of {args.iterations_number}', end='\r', flush=True)
-    
-    print('Simulation ended.')
-    print(f'Final length is: {length}')
+    length = get_total_length(queues)
+    live_chart = None
+    if args.live:
+        from live_chart import LiveChart
+        live_chart = LiveChart(instance, queues, length, name='Best schedule', interval=args.live_interval)
+        single_time_unit_width = live_chart.single_time_unit_width
+    else:
+        single_time_unit_width = draw_chart(args, queues, machines_no, jobs_no, length, 'initial',
+                                            name=f'Initial schedule - Length = {length}')
+
+    reporter.result(f'Initial length: {length} (gap: {optimality_gap(length, args.lower_bound):.2f}%)')
+
+    reporter.start()
+    reporter.event('start', file_name=args.file_name, engine=args.engine, lower_bound=args.lower_bound, length=length)
+    timers = None
+    if args.timers:
+        timers = PhaseTimers()
+        instrument_phases(timers)
+    search_start = time.perf_counter()
+
+    if live_chart is not None:
+        queues, length = live_chart.run(lambda: search(args, instance, queues, jobs, machines_no, reporter,
+                                                        single_time_unit_width=single_time_unit_width,
+                                                        checkpoint=checkpoint, on_best=live_chart.on_best))
+    else:
+        queues, length = search(args, instance, queues, jobs, machines_no, reporter,
+                                single_time_unit_width=single_time_unit_width, checkpoint=checkpoint)
+
+    search_time = time.perf_counter() - search_start
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+    if timers is not None:
+        reporter.event('phases', phases=[{'phase': phase, 'calls': calls, 'seconds': round(seconds, 6)}
+                                            for phase, calls, seconds in timers.phases()])
+    reporter.event('end', length=length, gap=round(optimality_gap(length, args.lower_bound), 4), search_time=round(search_time, 3))
+    reporter.close()
+    reporter.result('Simulation ended.')
+    reporter.result(f'Final length is: {length} (gap: {optimality_gap(length, args.lower_bound):.2f}%)')
+    if length <= args.lower_bound:
+        reporter.result('The schedule is optimal (its length equals the lower bound).')
+    reporter.result(f'Search time: {search_time:.3f} s')
+    if timers is not None:
+        reporter.result(timers.summary(search_time))
+    if profiler is not None:
+        pstats.Stats(args.profile, stream=reporter.output).sort_stats('cumulative').print_stats(20)
 
     # print_queues(queues)
-    draw_chart(queues, machines_no, jobs_no, length, name=f'Final schedule - Length = {length}', single_time_unit_width=single_time_unit_width)
+    if live_chart is not None:
+        live_chart.show(queues, length)
+    else:
+        draw_chart(args, queues, machines_no, jobs_no, length, 'final', name=f'Final schedule - Length = {length}',
+                    single_time_unit_width=single_time_unit_width)
@@ -0,0 +1,186 @@
+"""Micro-benchmarks of the hot path.
+
+Used to measure the functions the search spends its time in (the decoder, the neighbour generation, the length,
+the step lookup, the instance readers and the acceptance probability) on instances of different sizes, in
+nanoseconds per call and kilobytes allocated per call, and to compare them with a stored baseline, so that
+the optimisations of the hot path can be accepted safely.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import main
+from annealing import Annealing
+from instance_loader import sniff_format
+
+DEFAULT_INSTANCES = ['testdata/1/example5x5.csv', 'testdata/1/abz5.csv', 'testdata/2/tai15x15_1.csv',
+                     'testdata/2/tai50x15_1.csv', 'testdata/2/tai100x20_1.csv']
+DEFAULT_MIN_TIME                = 0.2
+DEFAULT_REPEATS                 = 5
+DEFAULT_TIME_TOLERANCE          = 25
+DEFAULT_MEMORY_TOLERANCE        = 10
+# number of calls whose allocations are measured
+MEMORY_CALLS                    = 20
+
+def benchmark_cases(file_name):
+    """Prepares the calls of the benchmarked functions on the instance from the file.
+    Returns the list of (function name, call without arguments).
+    """
+    with open(file_name) as file:
+        instance_format = sniff_format(file.read().split())
+    reader = main.read_csv if instance_format == 'orlib' else main.read_csv_2
+    jobs, jobs_no, machines_no = reader(file_name)
+    queues = main.fill_machine_queues(jobs, main.initialize_queues(machines_no, jobs_no))
+    length = main.get_total_length(queues)
+
+    steps = [(step.job_id, step.step_no) for job in jobs for step in job]
+    random.shuffle(steps)
+    steps_iterator = iter(())
+    def find_step():
+        nonlocal steps_iterator
+        step = next(steps_iterator, None)
+        if step is None:
+            steps_iterator = iter(steps)
+            step = next(steps_iterator)
+        return main.find_step(queues, *step)
+
+    annealing = Annealing(initial_temperature=main.DEFAULT_INITIAL_TEMPERATURE,
+                          iterations_number=main.DEFAULT_ITERATIONS_NUMBER)
+
+    return [
+        ('fill_machine_queues',             lambda: main.fill_machine_queues(jobs, main.initialize_queues(machines_no, jobs_no))),
+        ('generate_neighbour',              lambda: main.generate_neighbour(queues, machines_no, jobs)),
+        ('get_total_length',                lambda: main.get_total_length(queues)),
+        ('find_step',                       find_step),
+        (reader.__name__,                   lambda: reader(file_name)),
+        ('read_instance',                   lambda: main.read_instance(file_name, steps=False)),
+        ('read_instance_steps',             lambda: main.read_instance(file_name)),
+        ('Annealing.calculate_probability', lambda: annealing.calculate_probability(length, length + 5)),
+    ]
+
+def measure_time(call, min_time, repeats):
+    """Calls the function in loops lasting at least min_time seconds (the number of calls is calibrated first).
+    Returns the shortest time per call of the repeats in nanoseconds.
+    """
+    clock = time.perf_counter_ns
+    number = 1
+    while True:
+        start = clock()
+        for _ in range(number):
+            call()
+        elapsed = clock() - start
+        if elapsed >= min_time * 1e9:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(1.2 * min_time * 1e9 / elapsed)))
+
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        start = clock()
+        for _ in range(number):
+            call()
+        best = min(best, (clock() - start) / number)
+    return best
+
+def measure_memory(call):
+    """Calls the function MEMORY_CALLS times while tracing the memory allocations.
+    Returns the mean memory allocated by a call in kilobytes (the peak of the traced memory during the call).
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(MEMORY_CALLS):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            call()
+            total += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return total / MEMORY_CALLS / 1024
+
+def get_cmd_arguments():
+    """Parses commandline arguments and provides help when used in shell.
+
+    Returns parsed arguments object.
+    """
+    parser = argparse.ArgumentParser(description='Job Shop Scheduling Problem Solver micro-benchmarks.')
+
+    parser.add_argument('-i', '--instances', type=str, nargs='+',
+                        help='Input filenames. Default: from example5x5 up to tai100x20_1.', default=DEFAULT_INSTANCES)
+    parser.add_argument('-f', '--functions', type=str, nargs='+',
+                        help='Names of the functions to be measured. Default: all.')
+    parser.add_argument('-mt', '--min_time', type=float,
+                        help=f'Minimal duration of a measured loop in seconds. Default {DEFAULT_MIN_TIME}.', default=DEFAULT_MIN_TIME)
+    parser.add_argument('-rp', '--repeats', type=int,
+                        help=f'Number of the measured loops, the fastest one counts. Default {DEFAULT_REPEATS}.', default=DEFAULT_REPEATS)
+    parser.add_argument('-o', '--output', type=str, help='File the report is written to (JSON). Default: none.')
+    parser.add_argument('-b', '--baseline', type=str, help='Report to compare the results with (JSON). Default: none.')
+    parser.add_argument('-tt', '--time_tolerance', type=float,
+                        help=f'Allowed increase of the time per call against the baseline in percent. Default {DEFAULT_TIME_TOLERANCE}.',
+                        default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument('-mmt', '--memory_tolerance', type=float,
+                        help=f'Allowed increase of the memory allocated per call against the baseline in percent. Default {DEFAULT_MEMORY_TOLERANCE}.',
+                        default=DEFAULT_MEMORY_TOLERANCE)
+
+    return parser.parse_args()
+
+def compare(report, baseline, time_tolerance, memory_tolerance):
+    """Compares the results of the report with the results of the baseline (of the same function and instance).
+    Returns the list of the regressions found.
+    """
+    baseline_results = {(record['function'], record['instance']): record for record in baseline['results']}
+    regressions = []
+    for record in report['results']:
+        base = baseline_results.get((record['function'], record['instance']))
+        if base is None:
+            continue
+        label = f'{record["function"]} on {record["instance"]}'
+        if record['ns_per_call'] > base['ns_per_call'] * (1 + time_tolerance / 100):
+            regressions.append(f'{label}: {record["ns_per_call"]:.0f} ns/call against {base["ns_per_call"]:.0f}')
+        # a fraction of a kilobyte is within the noise of the tracing
+        if record['kb_per_call'] > base['kb_per_call'] * (1 + memory_tolerance / 100) + 0.5:
+            regressions.append(f'{label}: {record["kb_per_call"]:.1f} kB/call against {base["kb_per_call"]:.1f}')
+    return regressions
+
+
+if __name__ == '__main__':
+
+    args = get_cmd_arguments()
+
+    print(f'{"function":<34}{"instance":<14}{"ns/call":>14}{"kB/call":>12}')
+    results = []
+    for file_name in args.instances:
+        instance = os.path.splitext(os.path.basename(file_name))[0]
+        for function, call in benchmark_cases(file_name):
+            if args.functions is not None and function not in args.functions:
+                continue
+            random.seed(0)
+            ns_per_call = measure_time(call, args.min_time, args.repeats)
+            kb_per_call = measure_memory(call)
+            results.append({'function': function, 'instance': instance,
+                            'ns_per_call': round(ns_per_call, 1), 'kb_per_call': round(kb_per_call, 3)})
+            print(f'{function:<34}{instance:<14}{ns_per_call:>14.1f}{kb_per_call:>12.3f}', flush=True)
+
+    report = {
+        'python'    : platform.python_version(),
+        'machine'   : platform.machine(),
+        'results'   : results,
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.time_tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if regressions:
+            sys.exit(1)
+        print('No regressions against the baseline.')
@@ -0,0 +1,133 @@
+"""Move evaluation.
+
+Estimates the makespan of the schedule after a move from the heads and tails of the current
+schedule (see DisjunctiveGraph), without decoding it. Only the operations whose order changes
+are re-evaluated, so an adjacent swap is estimated in constant time.
+Adjacent swaps can also be estimated all at once with NumPy.
+"""
+
+import math
+
+import numpy as np
+
+def moved_segment(graph, operation, target):
+    """Returns the operations between the operation and the target (both included) in their order after the move,
+    together with the machine predecessor and successor of the segment (-1 if there is none).
+    """
+    machine_successor = graph.machine_successor
+    segment = []
+    _operation = machine_successor[operation]
+    while _operation >= 0:
+        segment.append(_operation)
+        if _operation == target:
+            # forward move, the operation is put right after the target
+            segment.append(operation)
+            return segment, graph.machine_predecessor[operation], machine_successor[target]
+        _operation = machine_successor[_operation]
+
+    # backward move, the operation is put right before the target
+    segment = [operation]
+    _operation = target
+    while _operation != operation:
+        segment.append(_operation)
+        _operation = machine_successor[_operation]
+    return segment, graph.machine_predecessor[target], machine_successor[operation]
+
+def estimate_move(graph, operation, target):
+    """Estimates the makespan after moving the operation to the place of the target in its machine queue.
+    The estimate is the longest path through the moved segment, computed from the new heads and tails
+    of its operations (Taillard's estimate).
+    """
+    instance = graph.instance
+    duration = instance.duration
+    heads = graph.heads
+    tails = graph.tails
+    segment, predecessor, successor = moved_segment(graph, operation, target)
+
+    new_heads = []
+    head = heads[predecessor] + duration[predecessor] if predecessor >= 0 else 0
+    for _operation in segment:
+        job_predecessor = instance.job_predecessor(_operation)
+        if job_predecessor >= 0 and heads[job_predecessor] + duration[job_predecessor] > head:
+            head = heads[job_predecessor] + duration[job_predecessor]
+        new_heads.append(head)
+        head += duration[_operation]
+
+    estimate = 0
+    tail = tails[successor] + duration[successor] if successor >= 0 else 0
+    for _operation, head in zip(reversed(segment), reversed(new_heads)):
+        job_successor = instance.job_successor(_operation)
+        if job_successor >= 0 and tails[job_successor] + duration[job_successor] > tail:
+            tail = tails[job_successor] + duration[job_successor]
+        if head + duration[_operation] + tail > estimate:
+            estimate = head + duration[_operation] + tail
+        tail += duration[_operation]
+
+    return estimate
+
+def best_move(graph, moves):
+    """Returns the move with the lowest estimated makespan and its estimate.
+    """
+    best = None
+    best_estimate = math.inf
+    for operation, target in moves:
+        estimate = estimate_move(graph, operation, target)
+        if estimate < best_estimate:
+            best = (operation, target)
+            best_estimate = estimate
+    return best, best_estimate
+
+def _ending(heads, duration, operations):
+    # heads[o] + duration[o], 0 where there is no operation (-1)
+    existing = np.maximum(operations, 0)
+    return np.where(operations >= 0, heads[existing] + duration[existing], 0)
+
+def estimate_swaps(graph, operations, targets):
+    """Estimates the makespans after swapping every operation with the target that follows it in its machine queue
+    in one batched computation (the same estimate as estimate_move).
+    Returns array of estimated makespans (infinity for the swaps that create a cycle).
+    """
+    instance = graph.instance
+    duration = np.frombuffer(instance.duration, dtype=np.intc)
+    step_no = np.frombuffer(instance.step_no, dtype=np.intc)
+    job_id = np.frombuffer(instance.job_id, dtype=np.intc)
+    heads = np.frombuffer(graph.heads, dtype=np.intc)
+    tails = np.frombuffer(graph.tails, dtype=np.intc)
+    machine_predecessor = np.frombuffer(graph.machine_predecessor, dtype=np.intc)
+    machine_successor = np.frombuffer(graph.machine_successor, dtype=np.intc)
+
+    u = np.asarray(operations)
+    v = np.asarray(targets)
+    last = instance.operations_no - 1
+
+    def job_predecessor(operations):
+        return np.where(step_no[operations] > 0, operations - 1, -1)
+
+    def job_successor(operations):
+        following = np.minimum(operations + 1, last)
+        same_job = (operations < last) & (job_id[following] == job_id[operations])
+        return np.where(same_job, operations + 1, -1)
+
+    # new order: predecessor, v, u, successor
+    head_v = np.maximum(_ending(heads, duration, job_predecessor(v)),
+                        _ending(heads, duration, machine_predecessor[u]))
+    head_u = np.maximum(_ending(heads, duration, job_predecessor(u)), head_v + duration[v])
+    tail_u = np.maximum(_ending(tails, duration, job_successor(u)),
+                        _ending(tails, duration, machine_successor[v]))
+    tail_v = np.maximum(_ending(tails, duration, job_successor(v)), tail_u + duration[u])
+
+    estimates = np.maximum(head_v + duration[v] + tail_v, head_u + duration[u] + tail_u).astype(np.float64)
+    # swapping consecutive steps of the same job (a job visiting the machine twice) creates a cycle
+    cyclic = (job_successor(u) == v) | (job_successor(v) == u)
+    estimates[cyclic] = math.inf
+    return estimates
+
+def best_swap(graph, operations, targets):
+    """Returns the swap with the lowest estimated makespan and its estimate (see estimate_swaps),
+    None and infinity if every swap creates a cycle.
+    """
+    estimates = estimate_swaps(graph, operations, targets)
+    best = int(np.argmin(estimates))
+    if estimates[best] == math.inf:
+        return None, math.inf
+    return (int(operations[best]), int(targets[best])), int(estimates[best])
@@ -0,0 +1,124 @@
+"""Parallel tempering (replica exchange).
+
+Several chains run the annealing moves on fixed temperatures in parallel processes. After every
+exchange interval the neighbouring temperatures are swapped between the chains with the Metropolis
+probability, so the schedules found by the hot, exploring chains can move down to the cold ones.
+"""
+
+import math
+import multiprocessing
+import random
+
+from annealing import Annealing
+from annealing_chain import AnnealingChain
+from stopping_rules import StoppingRules
+
+def replica_worker(connection, schedule, neighbourhood, target_makespan, seed):
+    """Runs the replica in a worker process.
+    Receives (temperature, iterations_number) and answers (current length, best length, accepted neighbours),
+    None ends the work and is answered by the best schedule.
+    """
+    random.seed(seed)
+    replica = AnnealingChain(schedule, neighbourhood=neighbourhood)
+    # a single annealing (and random generator) for the whole run, only its temperature changes
+    annealing = None
+    while True:
+        message = connection.recv()
+        if message is None:
+            connection.send(replica.best)
+            connection.close()
+            return
+        temperature, iterations_number = message
+        if annealing is None:
+            annealing = Annealing(initial_temperature=temperature, temperature_update='constant')
+        else:
+            annealing.set_temperature(temperature)
+        accepted_no = replica.run(annealing, iterations_number, target_makespan=target_makespan)
+        connection.send((replica.current.makespan, replica.best.makespan, accepted_no))
+
+def geometric_temperatures(min_temperature, max_temperature, replicas_no):
+    """Returns replicas_no temperatures spaced geometrically from min_temperature to max_temperature.
+    """
+    if replicas_no == 1:
+        return [min_temperature]
+    ratio = (max_temperature / min_temperature) ** (1 / (replicas_no - 1))
+    return [min_temperature * ratio ** level for level in range(replicas_no)]
+
+def parallel_tempering(schedule, replicas_no=4, min_temperature=1, max_temperature=50,
+                        stopping_rules=None, exchange_interval=100, neighbourhood='n5',
+                        lower_bound=0, seed=None, reporter=None):
+    """Performs the parallel tempering starting from given (array) schedule.
+    Every replica runs in its own process until the stopping rules (counting the iterations of a single replica)
+    end the search. The progress is reported by the reporter (if given).
+    Returns the best schedule found.
+    """
+    if stopping_rules is None:
+        stopping_rules = StoppingRules(iterations_number=50_000, target_makespan=lower_bound)
+    stopping_rules.start()
+    temperatures = geometric_temperatures(min_temperature, max_temperature, replicas_no)
+    # replica running on every temperature level
+    replicas = list(range(replicas_no))
+    connections = []
+    processes = []
+    for replica_id in range(replicas_no):
+        parent_connection, child_connection = multiprocessing.Pipe()
+        replica_seed = seed + replica_id if seed is not None else random.randrange(2 ** 32)
+        process = multiprocessing.Process(target=replica_worker,
+                                            args=(child_connection, schedule, neighbourhood,
+                                                    stopping_rules.target_makespan, replica_seed))
+        process.start()
+        connections.append(parent_connection)
+        processes.append(process)
+
+    best_length = schedule.makespan
+    swaps_no = 0
+    accepted_total = 0
+    attempts_no = 0
+    try:
+        iteration = 0
+        round_no = 0
+        while not stopping_rules.is_over(iteration, best_length):
+            iterations = stopping_rules.remaining_iterations(iteration, exchange_interval)
+            for level, replica_id in enumerate(replicas):
+                connections[replica_id].send((temperatures[level], iterations))
+            lengths = [None] * replicas_no
+            for replica_id, connection in enumerate(connections):
+                lengths[replica_id], replica_best, accepted_no = connection.recv()
+                accepted_total += accepted_no
+                if replica_best < best_length:
+                    best_length = replica_best
+                    stopping_rules.improved(iteration)
+                    if reporter is not None:
+                        reporter.improved(iteration, best_length)
+
+            iteration += iterations
+
+            # even and odd pairs of neighbouring levels take turns
+            for level in range(round_no % 2, replicas_no - 1, 2):
+                colder = replicas[level]
+                hotter = replicas[level + 1]
+                exponent = (1 / temperatures[level] - 1 / temperatures[level + 1]) * (lengths[colder] - lengths[hotter])
+                attempts_no += 1
+                if exponent >= 0 or random.random() < math.exp(exponent):
+                    replicas[level], replicas[level + 1] = hotter, colder
+                    swaps_no += 1
+
+            round_no += 1
+            if reporter is not None and iteration >= reporter.next_iteration:
+                # the acceptance rate of a single replica on average
+                reporter.report(iteration, stopping_rules.progress(iteration), accepted_no=accepted_total / replicas_no,
+                                best_length=best_length, swaps_accepted=f'{swaps_no}/{attempts_no}')
+
+        bests = []
+        for connection in connections:
+            connection.send(None)
+            bests.append(connection.recv())
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+
+    return min(bests, key=lambda best: best.makespan)
@@ -0,0 +1,71 @@
+"""PhaseTimers class.
+
+Used to measure where the time of a run goes: the functions of the phases are replaced by wrappers that count
+their calls and their cumulative time. Nothing is measured (and nothing slows down) unless they are instrumented.
+The times are inclusive, so the time of a phase contains the time of the phases it calls.
+"""
+
+import functools
+import time
+
+class PhaseTimers:
+    def __init__(self):
+        self.__times = {}
+        self.__calls = {}
+
+    def wrap(self, phase, function):
+        """Returns the function wrapped so that its calls and time are added to the phase.
+        """
+        times = self.__times
+        calls = self.__calls
+        times.setdefault(phase, 0)
+        calls.setdefault(phase, 0)
+        clock = time.perf_counter_ns
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                times[phase] += clock() - start
+                calls[phase] += 1
+
+        return timed
+
+    def instrument(self, owner, names):
+        """Replaces the functions (or methods) with given names of the owner (module or class) by the wrapped ones,
+        the phases are named by their qualified names.
+        """
+        for name in names:
+            function = getattr(owner, name)
+            setattr(owner, name, self.wrap(function.__qualname__, function))
+
+    def reset(self):
+        """Sets the calls and the times of all the phases to zero.
+        """
+        for phase in self.__times:
+            self.__times[phase] = 0
+            self.__calls[phase] = 0
+
+    def calls(self, phase):
+        """Returns the number of calls of the phase.
+        """
+        return self.__calls.get(phase, 0)
+
+    def phases(self):
+        """Returns the list of (phase, calls, total seconds) of the phases called at least once, the longest first.
+        """
+        phases = [(phase, self.__calls[phase], self.__times[phase] / 1e9) for phase in self.__times if self.__calls[phase]]
+        phases.sort(key=lambda phase: phase[2], reverse=True)
+        return phases
+
+    def summary(self, total_time):
+        """Returns the table of the phases with their share of the total_time (in seconds).
+        """
+        lines = [f'{"phase":<40}{"calls":>12}{"total [s]":>12}{"per call [us]":>15}{"share":>9}']
+        for phase, calls, seconds in self.phases():
+            share = seconds / total_time if total_time > 0 else 0
+            lines.append(f'{phase:<40}{calls:>12}{seconds:>12.3f}{1e6 * seconds / calls:>15.2f}{share:>9.1%}')
+        lines.append(f'{"total":<40}{"":>12}{total_time:>12.3f}')
+        return '\n'.join(lines)
@@ -0,0 +1,130 @@
+"""ProgressReporter class.
+
+Used to report the progress of a search without slowing it down: the progress is printed (and sent to the
+event stream) only once per reporting interval, given in seconds or in iterations. The event stream is written
+as JSON lines, so it can be piped to a monitoring tool (when it is written to the standard output, the text is
+printed to the standard error).
+"""
+
+import json
+import sys
+import time
+
+from lower_bounds import optimality_gap
+
+class ProgressReporter:
+    def __init__(self, interval=1.0, interval_iterations=None, quiet=False, events_file=None, lower_bound=0):
+        self.__interval = interval
+        self.__interval_iterations = interval_iterations
+        self.__quiet = quiet
+        self.__lower_bound = lower_bound
+        self.__events = None
+        # the stream the text is printed to
+        self.output = sys.stdout
+        if events_file == '-':
+            self.__events = sys.stdout
+            self.output = sys.stderr
+        elif events_file is not None:
+            self.__events = open(events_file, 'w')
+        self.__start_time = time.perf_counter()
+        self.__last_time = self.__start_time
+        self.__last_iteration = 0
+        self.__last_accepted_no = 0
+        # length of the progress line left on the terminal (it ends with a carriage return), 0 if there is none
+        self.__progress_width = 0
+        # the search calls report when its iteration reaches this one
+        self.next_iteration = 1 if interval_iterations is None else interval_iterations
+
+    def start(self):
+        """Starts measuring the time of the search (the reporter may print messages before it starts).
+        Returns self.
+        """
+        self.__start_time = time.perf_counter()
+        self.__last_time = self.__start_time
+        return self
+
+    def close(self):
+        """Ends the last progress line and closes the event stream.
+        """
+        if self.__progress_width > 0:
+            print(file=self.output)
+            self.__progress_width = 0
+        if self.__events is not None and self.__events is not sys.stdout:
+            self.__events.close()
+
+    def elapsed_time(self):
+        """Returns the number of seconds since the reporter was created.
+        """
+        return time.perf_counter() - self.__start_time
+
+    def event(self, name, **fields):
+        """Writes the event with given fields to the event stream (if any).
+        """
+        if self.__events is not None:
+            self.__events.write(json.dumps({'event': name, 'time': round(self.elapsed_time(), 3), **fields}) + '\n')
+            self.__events.flush()
+
+    def __print(self, text):
+        # the shorter text would leave the tail of the progress line visible, so the line is cleared first
+        if self.__progress_width > 0:
+            print(f'\r{" " * self.__progress_width}\r', end='', file=self.output)
+            self.__progress_width = 0
+        print(text, file=self.output)
+
+    def message(self, text):
+        """Prints the text unless quiet.
+        """
+        if not self.__quiet:
+            self.__print(text)
+
+    def result(self, text):
+        """Prints the text even if quiet.
+        """
+        self.__print(text)
+
+    def improved(self, iteration, length, source=None):
+        """Reports a new best schedule found in the iteration (by the source, e.g. a worker).
+        """
+        gap = optimality_gap(length, self.__lower_bound)
+        if not self.__quiet:
+            prefix = f'{source}: a' if source is not None else 'A'
+            self.__print(f'{prefix} better solution found with length: {length} (gap: {gap:.2f}%)')
+        self.event('incumbent', iteration=iteration, length=length, gap=round(gap, 4),
+                    **({'source': source} if source is not None else {}))
+
+    def report(self, iteration, progress, accepted_no=None, temperature=None, **fields):
+        """Reports the progress (text given by the search) if the reporting interval has passed, otherwise only
+        sets the next iteration to be reported. accepted_no is the total number of accepted neighbours.
+        """
+        now = time.perf_counter()
+        elapsed = now - self.__last_time
+        iterations = iteration - self.__last_iteration
+        rate = iterations / elapsed if elapsed > 0 else 0.0
+
+        if self.__interval_iterations is not None:
+            self.next_iteration = iteration + self.__interval_iterations
+        elif elapsed < self.__interval:
+            # check again when the interval is expected to pass
+            self.next_iteration = iteration + max(1, int(rate * (self.__interval - elapsed)))
+            return
+        else:
+            self.next_iteration = iteration + max(1, int(rate * self.__interval))
+
+        statistics = {'iterations_per_second': round(rate, 1)}
+        if accepted_no is not None and iterations > 0:
+            statistics['acceptance_rate'] = round((accepted_no - self.__last_accepted_no) / iterations, 4)
+            self.__last_accepted_no = accepted_no
+        if temperature is not None:
+            statistics['temperature'] = round(float(temperature), 4)
+        statistics.update(fields)
+
+        if not self.__quiet:
+            details = ', '.join(f'{name}: {value}' for name, value in statistics.items())
+            text = f'{progress} ({details})'
+            # padded to cover the previous progress line
+            print(f'{text:<{self.__progress_width}}', end='\r', flush=True, file=self.output)
+            self.__progress_width = max(self.__progress_width, len(text))
+        self.event('progress', iteration=iteration, **statistics)
+
+        self.__last_time = now
+        self.__last_iteration = iteration
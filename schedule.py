@@ -0,0 +1,81 @@
+"""Schedule class.
+
+Used to represent machine queues together with an index of the steps they contain.
+"""
+
+class Schedule:
+    def __init__(self, machines_no, jobs_no):
+        self.queues = [[] for _ in range(machines_no)]
+        # (job_id, step_no) -> (machine_id, position in the machine queue)
+        self.__positions = {}
+        # the timepoint when the last placed step of every job ends
+        self.__job_endings = [0] * jobs_no
+        # the timepoint when the last step of every machine queue ends
+        self.machine_endings = [0] * machines_no
+        self.__makespan = 0
+
+    def __len__(self):
+        return len(self.queues)
+
+    def __iter__(self):
+        return iter(self.queues)
+
+    def __getitem__(self, machine_id):
+        return self.queues[machine_id]
+
+    @property
+    def makespan(self):
+        """Max (queue) length, kept up to date as the steps are placed.
+        """
+        return self.__makespan
+
+    def contains(self, job_id, step_no):
+        """True if the step with given job_id and step_no is already scheduled.
+        """
+        return (job_id, step_no) in self.__positions
+
+    def find(self, job_id, step_no):
+        """Returns the scheduled step with given job_id and step_no (None if not scheduled).
+        """
+        position = self.__positions.get((job_id, step_no))
+        if position is None:
+            return None
+        machine_id, count = position
+        return self.queues[machine_id][count]
+
+    def position(self, job_id, step_no):
+        """Returns (machine_id, position) of the scheduled step (None if not scheduled).
+        """
+        return self.__positions.get((job_id, step_no))
+
+    def job_ending(self, job_id):
+        """Returns the timepoint when the job with given job_id ends (so far).
+        """
+        return self.__job_endings[job_id]
+
+    def append(self, machine_id, step):
+        """Appends the step at the end of the machine queue.
+        """
+        queue = self.queues[machine_id]
+        self.__positions[(step.job_id, step.step_no)] = (machine_id, len(queue))
+        queue.append(step)
+        self.__update_job_ending(step)
+        # steps are never moved once placed, so the queues only grow longer
+        self.machine_endings[machine_id] = step.stop
+        if self.__makespan < step.stop:
+            self.__makespan = step.stop
+
+    def insert(self, machine_id, count, step):
+        """Inserts the step into the machine queue before the position count.
+        """
+        queue = self.queues[machine_id]
+        queue.insert(count, step)
+        # the steps behind the inserted one are shifted by one position
+        for position in range(count, len(queue)):
+            _step = queue[position]
+            self.__positions[(_step.job_id, _step.step_no)] = (machine_id, position)
+        self.__update_job_ending(step)
+
+    def __update_job_ending(self, step):
+        if self.__job_endings[step.job_id] < step.stop:
+            self.__job_endings[step.job_id] = step.stop
@@ -0,0 +1,77 @@
+"""StoppingRules class.
+
+Used to decide when a search ends: after the number of iterations (or the time limit, if given), when the target
+makespan is reached or when the best makespan has not improved for the maximal number of stagnating iterations.
+"""
+
+import time
+
+class StoppingRules:
+    def __init__(self, iterations_number=100_000, time_limit=None, target_makespan=0, max_stagnation=None):
+        self.iterations_number = iterations_number
+        self.time_limit = time_limit
+        self.target_makespan = target_makespan
+        self.max_stagnation = max_stagnation
+        self.start()
+
+    def start(self, elapsed_time=0, last_improvement=0):
+        """Starts measuring the time and the stagnation (called by the process which performs the search),
+        a resumed search continues from the elapsed_time and the iteration of its last improvement.
+        Returns self.
+        """
+        self.__start_time = time.perf_counter() - elapsed_time
+        self.__last_improvement = last_improvement
+        return self
+
+    def get_state(self):
+        """Returns the state to be resumed by start.
+        """
+        return {'elapsed_time': self.elapsed_time(), 'last_improvement': self.__last_improvement}
+
+    def elapsed_time(self):
+        """Returns the number of seconds since the start.
+        """
+        return time.perf_counter() - self.__start_time
+
+    def elapsed_fraction(self, iteration):
+        """Returns the elapsed fraction of the time limit, or of the iterations number if there is no time limit.
+        """
+        if self.time_limit is None:
+            return iteration / self.iterations_number
+        return min(1, self.elapsed_time() / self.time_limit)
+
+    def remaining_iterations(self, iteration, chunk):
+        """Returns the number of iterations of the next chunk (at most chunk) starting at the iteration.
+        """
+        if self.time_limit is None:
+            return min(chunk, self.iterations_number - iteration)
+        return chunk
+
+    def improved(self, iteration):
+        """Notes that a new best schedule was found in the iteration.
+        """
+        self.__last_improvement = iteration
+
+    def is_reached(self, length):
+        """Returns True if the length is not longer than the target makespan.
+        """
+        return length <= self.target_makespan
+
+    def is_over(self, iteration, best_length):
+        """Returns True if the search should end before the iteration.
+        """
+        if self.is_reached(best_length):
+            return True
+        if self.time_limit is None:
+            if iteration >= self.iterations_number:
+                return True
+        elif self.elapsed_time() >= self.time_limit:
+            return True
+        return self.max_stagnation is not None and iteration - self.__last_improvement >= self.max_stagnation
+
+    def progress(self, iteration):
+        """Returns the progress of the search to be printed.
+        """
+        if self.time_limit is None:
+            return f'{iteration} of {self.iterations_number}'
+        return f'{self.elapsed_time():.1f} of {self.time_limit} s'
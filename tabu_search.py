@@ -0,0 +1,172 @@
+"""TabuSearch class.
+
+Used to perform the tabu search (TSAB by Nowicki and Smutnicki) on the array schedules: moves on the
+critical blocks, a tabu list of recently reversed arcs with aspiration and the back jump to the elite
+solutions when the search stagnates. When there is no elite solution left, the search restarts from the best
+schedule perturbed by random moves, so it runs until the stopping rules end it.
+"""
+
+import itertools
+import random
+from collections import deque
+
+from array_schedule import ArraySchedule
+from disjunctive_graph import DisjunctiveGraph
+from move_evaluation import estimate_move
+from stopping_rules import StoppingRules
+
+class TabuSearch:
+    def __init__(self, instance, neighbourhood='n5', stopping_rules=None,
+                tabu_tenure=8, elite_size=5, back_jump_iterations=1000, perturbation_moves=10, lower_bound=0):
+        self.__instance = instance
+        self.__neighbourhood = neighbourhood
+        if stopping_rules is None:
+            stopping_rules = StoppingRules(iterations_number=100_000, target_makespan=lower_bound)
+        self.__stopping_rules = stopping_rules
+        self.__tabu_tenure = tabu_tenure
+        self.__elite_size = elite_size
+        self.__back_jump_iterations = back_jump_iterations
+        self.__perturbation_moves = perturbation_moves
+
+    def search(self, schedule, reporter=None, on_best=None):
+        """Searches for a better schedule starting from the given one, until the stopping rules end it.
+        The progress is reported by the reporter (if given).
+        on_best is called with every new best schedule and its length (the schedule gets overwritten later,
+        so it has to be copied to be kept).
+        Returns the best schedule found.
+        """
+        instance = self.__instance
+        stopping_rules = self.__stopping_rules.start()
+        current = ArraySchedule(instance)
+        current.copy_from(schedule)
+        spare = ArraySchedule(instance)
+        best = ArraySchedule(instance)
+        best.copy_from(schedule)
+        graph = DisjunctiveGraph(instance, neighbourhood=self.__neighbourhood).update(current)
+
+        # (x, y): x was processed before y, the move reversing it back is forbidden
+        tabu = deque(maxlen=self.__tabu_tenure)
+        # (schedule, moves not tried yet, tabu list) saved for the back jumps
+        elite = deque(maxlen=self.__elite_size)
+        moves = graph.moves
+        save_elite = False
+        stagnation = 0
+
+        for iteration in itertools.count():
+            if stopping_rules.is_over(iteration, best.makespan):
+                break
+
+            move = None
+            if moves:
+                move = self.__select_move(graph, current, moves, tabu, best.makespan)
+
+            if move is None or stagnation >= self.__back_jump_iterations:
+                if elite:
+                    # back jump to the last elite solution and continue with its remaining moves
+                    solution, moves, saved_tabu = elite.pop()
+                    current.copy_from(solution)
+                    graph.update(current)
+                    tabu = deque(saved_tabu, maxlen=self.__tabu_tenure)
+                else:
+                    # restart from the perturbed best schedule with a cleared tabu list
+                    current.copy_from(best)
+                    if not self.__perturb(graph, current, spare):
+                        # no move leaves the best schedule (its critical path is a single job, so it is optimal)
+                        break
+                    moves = graph.moves
+                    tabu.clear()
+                save_elite = False
+                stagnation = 0
+                continue
+
+            if save_elite:
+                remaining = [_move for _move in moves if _move != move]
+                if remaining:
+                    solution = ArraySchedule(instance)
+                    solution.copy_from(current)
+                    elite.append((solution, remaining, list(tabu)))
+                save_elite = False
+
+            operation, target = move
+            spare.copy_from(current)
+            try:
+                spare.move(operation, spare.position[target])
+            except ValueError:
+                # the move creates a cycle (it is never generated, see DisjunctiveGraph.swap_creates_cycle),
+                # it is dropped instead of being tried again
+                moves = [_move for _move in moves if _move != move]
+                continue
+            tabu.append(self.__reversed_arc(current, move))
+            current, spare = spare, current
+            graph.update(current)
+            moves = graph.moves
+
+            stagnation += 1
+            if current.makespan < best.makespan:
+                best.copy_from(current)
+                save_elite = True
+                stagnation = 0
+                stopping_rules.improved(iteration)
+                if reporter is not None:
+                    reporter.improved(iteration, best.makespan)
+                if on_best is not None:
+                    on_best(best, best.makespan)
+
+            if reporter is not None and iteration + 1 >= reporter.next_iteration:
+                reporter.report(iteration + 1, stopping_rules.progress(iteration + 1),
+                                length=current.makespan, best_length=best.makespan)
+
+        return best
+
+    def __perturb(self, graph, schedule, spare):
+        """Applies perturbation_moves random moves of the neighbourhood to the schedule (the spare schedule is
+        overwritten) and updates the graph with the result.
+        Returns False if there was no move to apply.
+        """
+        graph.update(schedule)
+        for _ in range(self.__perturbation_moves):
+            moves = [move for move in graph.moves if not graph.swap_creates_cycle(*move)]
+            if not moves:
+                return False
+            operation, target = random.choice(moves)
+            spare.copy_from(schedule)
+            spare.move(operation, spare.position[target])
+            schedule.copy_from(spare)
+            graph.update(schedule)
+        return True
+
+    def __reversed_arc(self, schedule, move):
+        # the pair of operations whose order the move reverses, in their current order
+        operation, target = move
+        if schedule.position[operation] < schedule.position[target]:
+            return operation, target
+        return target, operation
+
+    def __select_move(self, graph, schedule, moves, tabu, best_length):
+        """Returns the move with the lowest estimated makespan that is not tabu, or that leads to a new best
+        (aspiration). If all the moves are tabu, the one forbidden for the longest time is chosen.
+        The moves across the job arcs (which create cycles) are never chosen.
+        """
+        best_move = None
+        best_estimate = None
+        oldest_move = None
+        oldest_age = None
+        for move in moves:
+            if graph.swap_creates_cycle(*move):
+                continue
+            first, second = self.__reversed_arc(schedule, move)
+            estimate = estimate_move(graph, *move)
+            if (second, first) in tabu:
+                if estimate >= best_length:
+                    age = tabu.index((second, first))
+                    if oldest_age is None or age < oldest_age:
+                        oldest_move = move
+                        oldest_age = age
+                    continue
+            if best_estimate is None or estimate < best_estimate:
+                best_move = move
+                best_estimate = estimate
+
+        if best_move is None:
+            return oldest_move
+        return best_move
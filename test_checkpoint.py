@@ -0,0 +1,37 @@
+"""Tests of the annealing checkpoints: a run resumed from a checkpoint ends exactly as the uninterrupted run.
+"""
+
+import random
+
+import pytest
+
+import main
+from checkpoint import load_checkpoint
+from lower_bounds import lower_bound
+from progress_reporter import ProgressReporter
+
+def run(argv, checkpoint=None):
+    """Runs the annealing as main does (the initial schedule included).
+    Returns the steps of the final schedule as (job_id, step_no, start) and its length.
+    """
+    args = main.get_cmd_arguments(argv)
+    random.seed(args.seed)
+    instance, jobs = main.read_instance(args.file_name, cache_dir=None, steps=args.representation == 'steps')
+    args.lower_bound = lower_bound(instance)
+    reporter = ProgressReporter(quiet=True, lower_bound=args.lower_bound)
+    queues = main.initial_schedule(args, instance, jobs, reporter=reporter)
+    queues, length = main.search(args, instance, queues, jobs, instance.machines_no, reporter, checkpoint=checkpoint)
+    return sorted((step.job_id, step.step_no, step.start) for queue in queues for step in queue), length
+
+@pytest.mark.parametrize('representation', ['steps', 'arrays'])
+def test_resumed_run_reproduces_uninterrupted_run(tmp_path, representation):
+    argv = ['-fn', 'testdata/1/abz5.csv', '-s', '1', '-in', '3000', '-r', representation, '-rd', 'none', '-q']
+    checkpoint_file = str(tmp_path / 'checkpoint.gz')
+    checkpoint_argv = argv + ['-cf', checkpoint_file, '-ci', '1000']
+
+    uninterrupted = run(argv)
+    # the last checkpoint is saved before the iteration 2000
+    assert run(checkpoint_argv) == uninterrupted
+    checkpoint = load_checkpoint(checkpoint_file)
+    assert checkpoint['step'] == 2000
+    assert run(checkpoint_argv + ['-re'], checkpoint=checkpoint) == uninterrupted
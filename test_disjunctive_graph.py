@@ -0,0 +1,73 @@
+"""Tests of the critical-block neighbourhoods on instances whose jobs visit a machine more than once
+(testdata/1/example5x5.csv, example.csv, easy.csv), where a critical block can hold consecutive steps of a job.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from array_schedule import ArraySchedule
+from disjunctive_graph import DisjunctiveGraph
+from giffler_thompson import giffler_thompson
+from instance_loader import load_instance
+from move_evaluation import best_swap, estimate_swaps
+
+REPEATED_MACHINE_INSTANCES = ['testdata/1/example5x5.csv', 'testdata/1/example.csv', 'testdata/1/easy.csv']
+
+def read_instance(file_name):
+    instance, _ = load_instance(file_name)
+    return instance
+
+def check_schedule(schedule):
+    """Asserts that the steps follow their jobs and do not overlap on the machines.
+    """
+    instance = schedule.instance
+    for operation in range(instance.operations_no):
+        predecessor = instance.job_predecessor(operation)
+        if predecessor >= 0:
+            assert schedule.start[operation] >= schedule.stop[predecessor]
+    for machine_id, steps in enumerate(schedule):
+        for previous, step in zip(steps, steps[1:]):
+            assert step.start >= previous.stop
+
+def random_schedules(instance, number, seed=1):
+    generator = random.Random(seed)
+    for _ in range(number):
+        priorities = list(range(instance.operations_no))
+        generator.shuffle(priorities)
+        yield giffler_thompson(instance, priorities)
+
+@pytest.mark.parametrize('file_name', REPEATED_MACHINE_INSTANCES)
+@pytest.mark.parametrize('neighbourhood', ['n1', 'n5', 'n6'])
+def test_moves_keep_schedule_acyclic(file_name, neighbourhood):
+    instance = read_instance(file_name)
+    graph = DisjunctiveGraph(instance, neighbourhood=neighbourhood)
+    neighbour = ArraySchedule(instance)
+    for schedule in random_schedules(instance, 50):
+        graph.update(schedule)
+        for operation, target in graph.moves:
+            assert instance.job_successor(operation) != target
+            assert instance.job_successor(target) != operation
+            neighbour.copy_from(schedule)
+            neighbour.move(operation, neighbour.position[target])
+            check_schedule(neighbour)
+
+def test_cyclic_swaps_are_never_chosen():
+    instance = read_instance('testdata/1/example5x5.csv')
+    # job 1 processes its steps 0 and 1 on machine 1, a swap of them would create a cycle
+    operation = instance.job_offsets[1]
+    target = operation + 1
+    assert instance.machine_id[operation] == instance.machine_id[target]
+
+    graph = DisjunctiveGraph(instance, neighbourhood='n1').update(next(random_schedules(instance, 1)))
+    estimates = estimate_swaps(graph, np.array([operation]), np.array([target]))
+    assert estimates[0] == np.inf
+    assert best_swap(graph, np.array([operation]), np.array([target])) == (None, np.inf)
+
+def test_cyclic_move_is_detected():
+    instance = read_instance('testdata/1/example5x5.csv')
+    schedule = ArraySchedule(instance).fill()
+    operation = instance.job_offsets[1]
+    with pytest.raises(ValueError):
+        schedule.move(operation, schedule.position[operation + 1])
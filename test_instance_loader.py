@@ -0,0 +1,73 @@
+"""Tests of the instance loader: the format recognition and the cache of the parsed arrays.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import instance_loader
+from instance_loader import load_arrays, load_instance, sniff_format
+
+# two jobs on two machines
+ORLIB = '2 2\n0 3 1 2\n1 4 0 1\n'
+TAILLARD = '2 2\nTimes\n3 2\n4 1\nMachines\n1 2\n2 1\n'
+MACHINE_IDS = [[0, 1], [1, 0]]
+DURATIONS = [[3, 2], [4, 1]]
+
+def write(path, content):
+    path.write_text(content)
+    return str(path)
+
+def test_formats_are_recognized():
+    assert sniff_format(ORLIB.split()) == 'orlib'
+    assert sniff_format(TAILLARD.split()) == 'taillard'
+    with pytest.raises(ValueError):
+        sniff_format('2 2 x'.split())
+
+@pytest.mark.parametrize('content', [ORLIB, TAILLARD])
+def test_both_formats_give_the_same_instance(tmp_path, content):
+    instance, jobs = load_instance(write(tmp_path / 'instance.txt', content), steps=True)
+
+    assert (instance.jobs_no, instance.machines_no) == (2, 2)
+    assert list(instance.machine_id) == [0, 1, 1, 0]
+    assert list(instance.duration) == [3, 2, 4, 1]
+    assert list(instance.machine_offsets) == [0, 2, 4]
+    assert [[(step.machine_id, step.duration) for step in job] for job in jobs] == [[(0, 3), (1, 2)], [(1, 4), (0, 1)]]
+
+def cached_files(cache_dir):
+    return [name for name in os.listdir(cache_dir) if name.endswith('.npy')]
+
+def test_cache_is_hit(tmp_path, monkeypatch):
+    monkeypatch.setattr(instance_loader, 'CACHE_MIN_SIZE', 0)
+    file_name = write(tmp_path / 'instance.txt', ORLIB)
+    cache_dir = str(tmp_path / 'cache')
+    load_arrays(file_name, cache_dir=cache_dir)
+    assert len(cached_files(cache_dir)) == 1
+
+    def parse_instance(content):
+        raise AssertionError('the cached arrays should be used')
+    monkeypatch.setattr(instance_loader, 'parse_instance', parse_instance)
+    machine_ids, durations = load_arrays(file_name, cache_dir=cache_dir)
+    assert machine_ids.tolist() == MACHINE_IDS
+    assert durations.tolist() == DURATIONS
+
+def test_corrupt_cache_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(instance_loader, 'CACHE_MIN_SIZE', 0)
+    file_name = write(tmp_path / 'instance.txt', TAILLARD)
+    cache_dir = str(tmp_path / 'cache')
+    load_arrays(file_name, cache_dir=cache_dir)
+    cache_file_name = os.path.join(cache_dir, cached_files(cache_dir)[0])
+    with open(cache_file_name, 'wb') as file:
+        file.write(b'not an array')
+
+    machine_ids, durations = load_arrays(file_name, cache_dir=cache_dir)
+    assert machine_ids.tolist() == MACHINE_IDS
+    assert durations.tolist() == DURATIONS
+    assert np.load(cache_file_name).tolist() == [MACHINE_IDS, DURATIONS]
+
+def test_small_files_are_not_cached(tmp_path):
+    file_name = write(tmp_path / 'instance.txt', ORLIB)
+    cache_dir = str(tmp_path / 'cache')
+    load_arrays(file_name, cache_dir=cache_dir)
+    assert not os.path.exists(cache_dir)
@@ -0,0 +1,47 @@
+"""Tests of the tabu search on the instances whose jobs visit a machine more than once
+(testdata/1/example5x5.csv, example.csv, easy.csv).
+"""
+
+import random
+import time
+
+import pytest
+
+from array_schedule import ArraySchedule
+from instance_loader import load_instance
+from lower_bounds import lower_bound
+from stopping_rules import StoppingRules
+from tabu_search import TabuSearch
+
+REPEATED_MACHINE_INSTANCES = ['testdata/1/example5x5.csv', 'testdata/1/example.csv', 'testdata/1/easy.csv']
+
+@pytest.mark.parametrize('file_name', REPEATED_MACHINE_INSTANCES)
+@pytest.mark.parametrize('neighbourhood', ['n1', 'n5', 'n6'])
+def test_search_ends_with_valid_schedule(file_name, neighbourhood):
+    instance, _ = load_instance(file_name)
+    initial = ArraySchedule(instance).fill()
+    stopping_rules = StoppingRules(iterations_number=2000, target_makespan=lower_bound(instance))
+
+    best = TabuSearch(instance, neighbourhood=neighbourhood, stopping_rules=stopping_rules).search(initial)
+
+    assert lower_bound(instance) <= best.makespan <= initial.makespan
+    for operation in range(instance.operations_no):
+        predecessor = instance.job_predecessor(operation)
+        if predecessor >= 0:
+            assert best.start[operation] >= best.stop[predecessor]
+    for steps in best:
+        for previous, step in zip(steps, steps[1:]):
+            assert step.start >= previous.stop
+
+def test_search_uses_its_time_limit():
+    # the elite solutions are used up quickly, the search has to restart to run until the time limit
+    random.seed(1)
+    instance, _ = load_instance('testdata/2/tai15x15_1.csv')
+    stopping_rules = StoppingRules(time_limit=1.0)
+    tabu_search = TabuSearch(instance, stopping_rules=stopping_rules, elite_size=1, back_jump_iterations=20)
+
+    start = time.perf_counter()
+    best = tabu_search.search(ArraySchedule(instance).fill())
+
+    assert time.perf_counter() - start >= 1.0
+    assert best.makespan >= lower_bound(instance)